@@ -1,9 +1,147 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.db import transaction
 
+from .cache import invalidate_choices, invalidate_on_commit
+from .feed import refresh_feed, refresh_for, update_comment_counts
 from .models import Category, Location, Post, Comment
+from .stats import update_user_stats
 
 
-admin.site.register(Category)
-admin.site.register(Location)
-admin.site.register(Post)
-admin.site.register(Comment)
+def set_published(modeladmin, request, queryset, is_published):
+    ids = list(queryset.values_list('pk', flat=True))
+    model = queryset.model
+    with transaction.atomic():
+        updated = model.objects.filter(pk__in=ids).update(
+            is_published=is_published
+        )
+        refresh_for(model, ids)
+        if model is Category:
+            # Posts invalidate cached content as they enter or leave the
+            # feed; the whole action shares one bump after the commit.
+            invalidate_on_commit()
+    invalidate_choices(model)
+    modeladmin.message_user(request, f'Обновлено объектов: {updated}.')
+
+
+@admin.action(description='Опубликовать выбранные объекты')
+def publish(modeladmin, request, queryset):
+    set_published(modeladmin, request, queryset, True)
+
+
+@admin.action(description='Снять с публикации выбранные объекты')
+def unpublish(modeladmin, request, queryset):
+    set_published(modeladmin, request, queryset, False)
+
+
+@admin.action(
+    description='Снять с публикации все посты и комментарии их авторов'
+)
+def unpublish_authors_content(modeladmin, request, queryset):
+    author_ids = list(
+        queryset.order_by().values_list('author_id', flat=True).distinct()
+    )
+    with transaction.atomic():
+        posts = Post.objects.filter(
+            author__in=author_ids, is_published=True
+        ).update(is_published=False)
+        comments = Comment.objects.filter(
+            author__in=author_ids, is_published=True
+        ).update(is_published=False)
+        refresh_feed(Post.objects.filter(author__in=author_ids))
+        update_comment_counts(
+            Comment.objects.filter(author__in=author_ids).values('post_id')
+        )
+        update_user_stats(author_ids)
+    modeladmin.message_user(
+        request,
+        f'Авторов: {len(author_ids)}, снято публикаций: {posts}, '
+        f'комментариев: {comments}.'
+    )
+
+
+class PostActionForm(ActionForm):
+    category = forms.ModelChoiceField(
+        Category.objects.all(),
+        required=False,
+        label='Категория'
+    )
+    location = forms.ModelChoiceField(
+        Location.objects.all(),
+        required=False,
+        widget=forms.TextInput(attrs={'size': 6}),
+        label='ID местоположения'
+    )
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ('title', 'slug', 'is_published', 'created_at')
+    list_filter = ('is_published',)
+    search_fields = ('title',)
+    prepopulated_fields = {'slug': ('title',)}
+    actions = (publish, unpublish)
+
+
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    list_display = ('name', 'is_published', 'created_at')
+    list_filter = ('is_published',)
+    search_fields = ('name',)
+    actions = (publish, unpublish)
+
+
+@admin.register(Post)
+class PostAdmin(admin.ModelAdmin):
+    list_display = (
+        'title', 'author', 'category', 'location', 'pub_date', 'is_published'
+    )
+    list_select_related = ('author', 'category', 'location')
+    list_filter = ('is_published', 'pub_date', 'category')
+    search_fields = ('^title', '=author__username')
+    raw_id_fields = ('author',)
+    autocomplete_fields = ('category', 'location')
+    show_full_result_count = False
+    action_form = PostActionForm
+    actions = (publish, unpublish, 'reassign', unpublish_authors_content)
+
+    @admin.action(
+        description='Перенести в выбранную категорию и местоположение'
+    )
+    def reassign(self, request, queryset):
+        form = self.action_form(request.POST)
+        changes = {
+            name: value
+            for name, value in form.cleaned_data.items()
+            if name in ('category', 'location') and value is not None
+        } if form.is_valid() else {}
+        if not changes:
+            self.message_user(
+                request,
+                'Укажите категорию или местоположение.',
+                messages.WARNING
+            )
+            return
+        ids = list(queryset.values_list('pk', flat=True))
+        with transaction.atomic():
+            updated = Post.objects.filter(pk__in=ids).update(**changes)
+            refresh_for(Post, ids)
+        self.message_user(request, f'Перенесено публикаций: {updated}.')
+
+
+@admin.register(Comment)
+class CommentAdmin(admin.ModelAdmin):
+    list_display = (
+        '__str__', 'post_title', 'author', 'created_at', 'is_published'
+    )
+    list_select_related = ('post', 'author')
+    list_filter = ('is_published', 'created_at')
+    search_fields = ('=author__username', '=post__id')
+    raw_id_fields = ('post', 'author')
+    show_full_result_count = False
+    actions = (publish, unpublish, unpublish_authors_content)
+
+    @admin.display(description='Публикация', ordering='post__title')
+    def post_title(self, comment):
+        return comment.post.title
@@ -0,0 +1,219 @@
+import base64
+import json
+from functools import wraps
+
+from django.db.models import Case, F, Q, When
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_GET
+
+from .models import Category, Comment, Location, Post, User
+from .views import POSTS_ON_PAGE, get_posts
+
+
+API_MAX_PAGE_SIZE = 100
+AUTOCOMPLETE_LIMIT = 20
+
+POST_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'image': 'image',
+    'author': 'author__username',
+    'category': 'category__slug',
+    'location': 'location_name',
+    'comment_count': 'comment_count',
+}
+COMMENT_FIELDS = {
+    'id': 'id',
+    'text': 'text',
+    'created_at': 'created_at',
+    'author': 'author__username',
+}
+
+
+class ApiError(Exception):
+    pass
+
+
+def api_view(view):
+    @require_GET
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return JsonResponse(view(request, *args, **kwargs))
+        except ApiError as error:
+            return JsonResponse({'error': str(error)}, status=400)
+        except Http404:
+            return JsonResponse({'error': 'Не найдено.'}, status=404)
+    return wrapper
+
+
+def encode_cursor(row, date_field):
+    raw = json.dumps([row[date_field].isoformat(), row['id']])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        date, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        date = parse_datetime(date)
+    except (TypeError, ValueError):
+        date = pk = None
+    if date is None or not isinstance(pk, int):
+        raise ApiError('Некорректный курсор.')
+    return date, pk
+
+
+def get_fields(request, available):
+    if 'fields' not in request.GET:
+        return list(available)
+    fields = [name for name in request.GET['fields'].split(',') if name]
+    unknown = sorted(set(fields) - set(available))
+    if unknown:
+        raise ApiError('Неизвестные поля: ' + ', '.join(unknown))
+    if not fields:
+        raise ApiError('Не выбрано ни одного поля.')
+    return fields
+
+
+def get_page_size(request):
+    try:
+        size = int(request.GET.get('limit', POSTS_ON_PAGE))
+    except ValueError:
+        raise ApiError('Параметр limit должен быть числом.')
+    return min(max(size, 1), API_MAX_PAGE_SIZE)
+
+
+def serialize(row, fields, available_fields):
+    data = {name: row[available_fields[name]] for name in fields}
+    if 'image' in data:
+        data['image'] = (
+            Post.image.field.storage.url(data['image'])
+            if data['image'] else None
+        )
+    return data
+
+
+def paginate(request, queryset, fields, available_fields, date_field):
+    lookups = {available_fields[name] for name in fields}
+    lookups |= {date_field, 'id'}
+    if 'cursor' in request.GET:
+        date, pk = decode_cursor(request.GET['cursor'])
+        queryset = queryset.filter(
+            Q(**{f'{date_field}__lt': date})
+            | Q(**{date_field: date, 'id__lt': pk})
+        )
+    page_size = get_page_size(request)
+    rows = list(
+        queryset.order_by(f'-{date_field}', '-id')
+        .values(*lookups)[:page_size + 1]
+    )
+    next_url = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        query = request.GET.copy()
+        query['cursor'] = encode_cursor(rows[-1], date_field)
+        next_url = request.build_absolute_uri(
+            f'{request.path}?{query.urlencode()}'
+        )
+    return {
+        'results': [
+            serialize(row, fields, available_fields) for row in rows
+        ],
+        'next': next_url,
+    }
+
+
+def get_post_rows(posts, fields, filter=True):
+    return get_posts(
+        posts,
+        select_related=False,
+        filter=filter,
+        count_comment='comment_count' in fields,
+    ).annotate(location_name=Case(
+        When(location__is_published=True, then=F('location__name'))
+    ))
+
+
+def paginate_posts(request, posts, filter=True):
+    fields = get_fields(request, POST_FIELDS)
+    return paginate(
+        request,
+        get_post_rows(posts, fields, filter),
+        fields,
+        POST_FIELDS,
+        'pub_date'
+    )
+
+
+def get_post_row(request, post_id, fields):
+    lookups = {POST_FIELDS[name] for name in fields}
+    posts = Post.objects.filter(pk=post_id)
+    row = get_post_rows(posts, fields).values(*lookups).first()
+    if row is None and request.user.is_authenticated:
+        row = get_post_rows(
+            posts.filter(author=request.user), fields, filter=False
+        ).values(*lookups).first()
+    if row is None:
+        raise Http404
+    return row
+
+
+@api_view
+def feed(request):
+    return paginate_posts(request, Post.objects.all())
+
+
+@api_view
+def category_feed(request, category_slug):
+    category = get_object_or_404(
+        Category.objects.only('pk'),
+        slug=category_slug,
+        is_published=True
+    )
+    return paginate_posts(request, category.posts.all())
+
+
+@api_view
+def profile_feed(request, username):
+    author = get_object_or_404(User.objects.only('pk'), username=username)
+    return paginate_posts(
+        request, author.posts.all(), filter=request.user != author
+    )
+
+
+@api_view
+def post_detail(request, post_id):
+    fields = get_fields(request, POST_FIELDS)
+    return serialize(
+        get_post_row(request, post_id, fields), fields, POST_FIELDS
+    )
+
+
+@api_view
+def comment_list(request, post_id):
+    get_post_row(request, post_id, ['id'])
+    return paginate(
+        request,
+        Comment.objects.filter(post_id=post_id, is_published=True),
+        get_fields(request, COMMENT_FIELDS),
+        COMMENT_FIELDS,
+        'created_at'
+    )
+
+
+@api_view
+def location_autocomplete(request):
+    query = request.GET.get('q', '').strip()
+    locations = Location.objects.filter(is_published=True)
+    if query:
+        locations = locations.filter(name__istartswith=query)
+    return {
+        'results': list(
+            locations.order_by('name')
+            .values('id', 'name')[:AUTOCOMPLETE_LIMIT]
+        )
+    }
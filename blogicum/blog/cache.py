@@ -0,0 +1,56 @@
+import time
+from threading import local
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import transaction
+
+
+CONTENT_VERSION_KEY = 'blog:content_version'
+
+_pending = local()
+
+
+def get_version_cache():
+    # Cached pages may stay per process, the version must be shared.
+    return caches[settings.CONTENT_VERSION_CACHE]
+
+
+def get_content_version():
+    return get_version_cache().get_or_set(
+        CONTENT_VERSION_KEY, time.time_ns, None
+    )
+
+
+def content_cache_key(*parts):
+    return ':'.join(map(str, ('blog', get_content_version(), *parts)))
+
+
+def invalidate_content():
+    get_version_cache().set(CONTENT_VERSION_KEY, time.time_ns(), None)
+
+
+def invalidate_pending():
+    if getattr(_pending, 'content', False):
+        _pending.content = False
+        invalidate_content()
+
+
+def invalidate_on_commit():
+    """Invalidate cached content once the current transaction commits.
+
+    A bump before the commit would let a concurrent request cache the old
+    state under the new version. Calls made during one transaction, e.g.
+    by every chunk of a bulk admin action, share the first callback's
+    bump; a flag left over by a rollback only causes a spare bump later.
+    """
+    _pending.content = True
+    transaction.on_commit(invalidate_pending)
+
+
+def choices_cache_key(model):
+    return f'blog:choices:{model._meta.label_lower}'
+
+
+def invalidate_choices(model):
+    cache.delete(choices_cache_key(model))
@@ -0,0 +1,9 @@
+from django.utils.text import Truncator
+
+
+EXCERPT_WORDS = 10
+
+
+def make_excerpt(text):
+    """Plain-text beginning of a post shown on feed cards."""
+    return Truncator(text).words(EXCERPT_WORDS, truncate=' …')
@@ -0,0 +1,205 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .cache import invalidate_on_commit
+from .models import Category, Comment, FeedEntry, Location, Post
+from .stats import update_user_stats
+from .timeline import fan_out
+from .views import get_post_cards
+
+
+FEED_CHUNK_SIZE = 1000
+FEED_UPDATE_FIELDS = (
+    'pub_date',
+    'author',
+    'category',
+    'location',
+    'title',
+    'excerpt',
+    'image',
+    'image_width',
+    'image_height',
+    'image_color',
+    'author_username',
+    'category_title',
+    'category_slug',
+    'location_name',
+    'comment_count',
+)
+# Entry fields shown by the categories index besides the counters.
+SHOWN_FIELDS = ('title', 'pub_date')
+
+
+def build_entry(post):
+    location = post.location
+    return FeedEntry(
+        post_id=post.pk,
+        pub_date=post.pub_date,
+        author_id=post.author_id,
+        category_id=post.category_id,
+        location_id=post.location_id,
+        title=post.title,
+        excerpt=post.excerpt,
+        image=post.image.name or '',
+        image_width=post.image_width,
+        image_height=post.image_height,
+        image_color=post.image_color or '',
+        author_username=post.author.username,
+        category_title=post.category.title,
+        category_slug=post.category.slug,
+        location_name=(
+            location.name if location and location.is_published else None
+        ),
+        comment_count=post.comment_count,
+    )
+
+
+def latest_pub_date(model):
+    return Subquery(
+        FeedEntry.objects.filter(**{model._meta.model_name: OuterRef('pk')})
+        .order_by('-pub_date').values('pub_date')[:1]
+    )
+
+
+def update_counters(old, new):
+    """Shift visible post counters by the difference of {post: place} maps.
+
+    Places are (category_id, location_id) pairs of feed entries before and
+    after a sync; only categories and locations that are touched get their
+    `last_published_at` recomputed.
+    """
+    deltas = {Category: Counter(), Location: Counter()}
+    for places, sign in ((old.values(), -1), (new.values(), 1)):
+        for category_id, location_id in places:
+            deltas[Category][category_id] += sign
+            if location_id:
+                deltas[Location][location_id] += sign
+    for model, delta in deltas.items():
+        for pk, change in delta.items():
+            if change:
+                model.objects.filter(pk=pk).update(
+                    posts_count=F('posts_count') + change
+                )
+        if delta:
+            model.objects.filter(pk__in=list(delta)).update(
+                last_published_at=latest_pub_date(model)
+            )
+
+
+def recount_counters():
+    """Recompute all category and location counters from the feed."""
+    for model in (Category, Location):
+        model.objects.update(
+            posts_count=Coalesce(Subquery(
+                FeedEntry.objects.filter(
+                    **{model._meta.model_name: OuterRef('pk')}
+                ).order_by().values(model._meta.model_name)
+                .annotate(count=Count('pk')).values('count')
+            ), 0),
+            last_published_at=latest_pub_date(model),
+        )
+
+
+def get_places(post_ids):
+    return {
+        post_id: (category_id, location_id)
+        for post_id, category_id, location_id
+        in FeedEntry.objects.filter(post_id__in=post_ids).values_list(
+            'post_id', 'category_id', 'location_id'
+        )
+    }
+
+
+def get_shown(post_ids):
+    """Places plus the fields cached content pages show, by post."""
+    return {
+        post_id: tuple(row)
+        for post_id, *row
+        in FeedEntry.objects.filter(post_id__in=post_ids).values_list(
+            'post_id', 'category_id', 'location_id', *SHOWN_FIELDS
+        )
+    }
+
+
+def sync_posts(post_ids):
+    """Insert, update or remove feed entries of the given posts.
+
+    Posts that enter the feed, however they became visible, are fanned
+    out to their followers' timelines; their ids are returned. Cached
+    content pages are invalidated when posts enter, leave or move, or
+    when a visible post changes what they show.
+    """
+    with transaction.atomic():
+        old_shown = get_shown(post_ids)
+        old = {post_id: row[:2] for post_id, row in old_shown.items()}
+        entries = [
+            build_entry(post)
+            for post in get_post_cards(Post.objects.filter(pk__in=post_ids))
+        ]
+        FeedEntry.objects.filter(post_id__in=post_ids).exclude(
+            post_id__in=[entry.post_id for entry in entries]
+        ).delete()
+        FeedEntry.objects.bulk_create(
+            entries,
+            update_conflicts=True,
+            unique_fields=('post',),
+            update_fields=FEED_UPDATE_FIELDS,
+        )
+        new_shown = {
+            entry.post_id: (
+                entry.category_id,
+                entry.location_id,
+                *(getattr(entry, name) for name in SHOWN_FIELDS),
+            )
+            for entry in entries
+        }
+        new = {post_id: row[:2] for post_id, row in new_shown.items()}
+        update_counters(old, new)
+        update_user_stats(
+            Post.objects.filter(pk__in=post_ids).values('author')
+        )
+    if old_shown != new_shown:
+        invalidate_on_commit()
+    added = [post_id for post_id in new if post_id not in old]
+    fan_out(added)
+    return added
+
+
+def refresh_feed(posts, chunk_size=FEED_CHUNK_SIZE):
+    """Resync feed entries of every post in the queryset, chunk by chunk."""
+    post_ids = posts.order_by('pk').values_list('pk', flat=True).distinct()
+    last_pk = 0
+    while True:
+        chunk = list(post_ids.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return
+        sync_posts(chunk)
+        last_pk = chunk[-1]
+
+
+def update_comment_counts(post_ids):
+    FeedEntry.objects.filter(post_id__in=post_ids).update(
+        comment_count=Coalesce(Subquery(
+            Comment.objects.filter(post=OuterRef('post'), is_published=True)
+            .order_by().values('post').annotate(count=Count('pk'))
+            .values('count')
+        ), 0)
+    )
+
+
+def refresh_for(model, ids):
+    """Resync the feed after a bulk update of `model` rows with `ids`."""
+    if model is Comment:
+        comments = Comment.objects.filter(pk__in=ids)
+        update_comment_counts(comments.values('post_id'))
+        update_user_stats(comments.values('author'))
+        return
+    lookup = {
+        Post: 'pk__in',
+        Category: 'category__in',
+        Location: 'location__in',
+    }[model]
+    refresh_feed(Post.objects.filter(**{lookup: ids}))
@@ -1,10 +1,48 @@
+import uuid
+
 from django import forms
+from django.core.cache import cache
+from django.db.models import Q
+from django.urls import reverse_lazy
+
+from .cache import choices_cache_key
+from .models import Category, Location, Post, Comment, User
+
+
+CHOICES_LIMIT = 100
+CHOICES_CACHE_TIMEOUT = 60 * 60
+
+
+def get_cached_choices(model, label_field):
+    """Published (pk, label) pairs or None if there are too many of them."""
 
+    def load():
+        choices = list(
+            model.objects.filter(is_published=True)
+            .values_list('pk', label_field)[:CHOICES_LIMIT + 1]
+        )
+        return choices if len(choices) <= CHOICES_LIMIT else None
 
-from .models import Post, Comment, User
+    return cache.get_or_set(
+        choices_cache_key(model), load, CHOICES_CACHE_TIMEOUT
+    )
 
 
-class PostForm(forms.ModelForm):
+class IdempotentForm(forms.ModelForm):
+    """Model form carrying a one-off key that makes resubmits harmless."""
+
+    idempotency_key = forms.UUIDField(
+        widget=forms.HiddenInput,
+        required=False,
+        initial=uuid.uuid4,
+    )
+
+    def clean_idempotency_key(self):
+        # A submission without a key can't be repeated, so any key will do.
+        return self.cleaned_data['idempotency_key'] or uuid.uuid4()
+
+
+class PostForm(IdempotentForm):
     class Meta:
         model = Post
         exclude = ('author', )
@@ -17,8 +55,35 @@ class PostForm(forms.ModelForm):
             )
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.set_choices('category', Category, 'title')
+        self.set_choices(
+            'location',
+            Location,
+            'name',
+            reverse_lazy('blog:location_autocomplete')
+        )
+
+    def set_choices(self, name, model, label_field, autocomplete_url=None):
+        field = self.fields[name]
+        current_id = getattr(self.instance, f'{name}_id')
+        field.queryset = model.objects.filter(
+            Q(is_published=True) | Q(pk=current_id)
+        )
+        choices = get_cached_choices(model, label_field)
+        if choices is None:
+            if autocomplete_url is None:
+                return
+            field.widget.attrs['data-autocomplete-url'] = autocomplete_url
+            choices = []
+        if current_id and current_id not in dict(choices):
+            label = getattr(getattr(self.instance, name), label_field)
+            choices = [(current_id, label), *choices]
+        field.choices = [('', field.empty_label), *choices]
+
 
-class CommentForm(forms.ModelForm):
+class CommentForm(IdempotentForm):
     class Meta:
         model = Comment
         fields = ('text', )
@@ -0,0 +1,165 @@
+import os
+import time
+from itertools import islice
+from threading import local
+
+from django.db import transaction
+
+from .models import ImageInfo, Post
+
+
+IMAGE_BATCH_SIZE = 1000
+# Files younger than this may belong to a post that is not committed yet.
+ORPHAN_MIN_AGE = 24 * 60 * 60
+# Files released after a commit are kept if an upload has just reused them.
+RELEASE_MIN_AGE = 60 * 60
+
+_released = local()
+
+
+def get_storage():
+    return Post.image.field.storage
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def referenced_images(names):
+    """Names among `names` that some post still uses as its image."""
+    return set(
+        Post.objects.filter(image__in=names)
+        .values_list('image', flat=True).distinct()
+    )
+
+
+def is_recent(storage, name, deadline):
+    try:
+        return os.stat(storage.path(name)).st_mtime >= deadline
+    except FileNotFoundError:
+        return False
+
+
+def release_images(names, min_age=0):
+    """Delete the files among `names` that no post refers to any more.
+
+    Content-addressed files are shared by posts with identical images, so
+    a file is only removed once its last reference is gone. Files modified
+    less than `min_age` seconds ago are kept for collect_media.
+    """
+    storage = get_storage()
+    deadline = time.time() - min_age
+    orphans = set()
+    for batch in batched(sorted(set(names) - {''}), IMAGE_BATCH_SIZE):
+        orphans |= set(batch) - referenced_images(batch)
+    if min_age:
+        orphans = {
+            name for name in orphans
+            if not is_recent(storage, name, deadline)
+        }
+    for name in orphans:
+        storage.delete(name)
+    ImageInfo.objects.filter(name__in=orphans).delete()
+    return orphans
+
+
+def release_pending():
+    names, _released.names = getattr(_released, 'names', set()), set()
+    release_images(names, RELEASE_MIN_AGE)
+
+
+def release_on_commit(names):
+    """Release `names` once the current transaction commits.
+
+    Names gathered during one transaction, e.g. from the posts of a
+    deleted user, are released together by the first callback. Names left
+    over by a rollback are released later: release_images() checks the
+    references again, so this is harmless.
+    """
+    names = {name for name in names if name}
+    if names:
+        _released.names = getattr(_released, 'names', set()) | names
+        transaction.on_commit(release_pending)
+
+
+def iter_files(storage, directory, ordered=False):
+    """Yield (name, mtime) of the files under `directory` as they are read.
+
+    Unlike Storage.listdir() the tree is never loaded whole. With
+    `ordered`, names come in string order and one directory listing at a
+    time is held for sorting.
+    """
+    try:
+        entries = os.scandir(storage.path(directory))
+    except FileNotFoundError:
+        return
+    with entries:
+        if ordered:
+            # "a/b" sorts after "a.jpg" in a string comparison of names.
+            entries = sorted(entries, key=lambda entry: (
+                entry.name + '/'
+                if entry.is_dir(follow_symlinks=False) else entry.name
+            ))
+        for entry in entries:
+            name = f'{directory}/{entry.name}'
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_files(storage, name, ordered)
+            elif entry.is_file(follow_symlinks=False):
+                yield name, entry.stat(follow_symlinks=False).st_mtime
+
+
+def collect_orphans(
+    min_age=ORPHAN_MIN_AGE, batch_size=IMAGE_BATCH_SIZE, dry_run=False
+):
+    """Yield and delete uploaded files no post refers to.
+
+    The upload directory is scanned lazily and checked against the indexed
+    Post.image column one batch at a time.
+    """
+    storage = get_storage()
+    deadline = time.time() - min_age
+    files = (
+        name
+        for name, mtime in iter_files(storage, Post.image.field.upload_to)
+        if mtime < deadline
+    )
+    for batch in batched(files, batch_size):
+        orphans = sorted(set(batch) - referenced_images(batch))
+        for name in orphans:
+            if not dry_run:
+                storage.delete(name)
+            yield name
+        if not dry_run:
+            ImageInfo.objects.filter(name__in=orphans).delete()
+
+
+def reconcile(min_age=ORPHAN_MIN_AGE):
+    """Walk stored files and Post.image values side by side.
+
+    Yields ('orphan', name) for files no post refers to and ('missing',
+    name) for images whose file is gone. Both listings are streamed in
+    name order and merged, so neither is held in memory. The database
+    collation may order names differently, so these are only candidates
+    for the caller to verify.
+    """
+    deadline = time.time() - min_age
+    files = iter_files(get_storage(), Post.image.field.upload_to, True)
+    images = (
+        Post.objects.exclude(image='').order_by('image')
+        .values_list('image', flat=True).distinct()
+        .iterator(IMAGE_BATCH_SIZE)
+    )
+    file, image = next(files, None), next(images, None)
+    while file is not None or image is not None:
+        if image is None or file is not None and file[0] < image:
+            name, mtime = file
+            if mtime < deadline:
+                yield 'orphan', name
+            file = next(files, None)
+        elif file is None or image < file[0]:
+            yield 'missing', image
+            image = next(images, None)
+        else:
+            file, image = next(files, None), next(images, None)
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from blog.excerpts import make_excerpt
+from blog.feed import FEED_CHUNK_SIZE
+from blog.models import FeedEntry, Post
+
+
+class Command(BaseCommand):
+    help = 'Recompute post excerpts and copy them into the feed table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=FEED_CHUNK_SIZE
+        )
+
+    def handle(self, *args, **options):
+        rows = Post.objects.order_by('pk').values_list('pk', 'text')
+        last_pk = 0
+        total = 0
+        while True:
+            chunk = list(rows.filter(pk__gt=last_pk)[:options['chunk_size']])
+            if not chunk:
+                break
+            ids = [pk for pk, _ in chunk]
+            with transaction.atomic():
+                Post.objects.bulk_update(
+                    [
+                        Post(pk=pk, excerpt=make_excerpt(text))
+                        for pk, text in chunk
+                    ],
+                    ['excerpt'],
+                )
+                FeedEntry.objects.filter(post__in=ids).update(
+                    excerpt=Subquery(
+                        Post.objects.filter(pk=OuterRef('post'))
+                        .values('excerpt')
+                    )
+                )
+            total += len(chunk)
+            last_pk = ids[-1]
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлено анонсов: {total}'
+        ))
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from blog.feed import FEED_CHUNK_SIZE
+from blog.models import FeedEntry, ImageInfo, Post
+from blog.placeholders import read_image
+
+
+class Command(BaseCommand):
+    help = (
+        'Store dimensions and placeholder colours of post images uploaded '
+        'before they were recorded, and copy them into the feed table.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=FEED_CHUNK_SIZE
+        )
+
+    def handle(self, *args, **options):
+        storage = Post.image.field.storage
+        names = Post.objects.exclude(image='').exclude(
+            image__in=ImageInfo.objects.values('name')
+        ).order_by('image').values_list('image', flat=True).distinct()
+        last_name = ''
+        total = failed = 0
+        while True:
+            chunk = list(
+                names.filter(image__gt=last_name)[:options['chunk_size']]
+            )
+            if not chunk:
+                break
+            infos = []
+            for name in chunk:
+                try:
+                    with storage.open(name, 'rb') as file:
+                        width, height, color = read_image(file)
+                except OSError as error:
+                    failed += 1
+                    self.stderr.write(f'{name}: {error}')
+                    continue
+                infos.append(ImageInfo(
+                    name=name, width=width, height=height, color=color
+                ))
+            with transaction.atomic():
+                ImageInfo.objects.bulk_create(infos, ignore_conflicts=True)
+                stored = ImageInfo.objects.filter(name=OuterRef('image'))
+                FeedEntry.objects.filter(
+                    image__in=[info.name for info in infos]
+                ).update(**{
+                    f'image_{field}': Subquery(stored.values(field))
+                    for field in ('width', 'height', 'color')
+                })
+            total += len(infos)
+            last_name = chunk[-1]
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлено изображений: {total}, не прочитано: {failed}'
+        ))
@@ -0,0 +1,265 @@
+import copy
+import statistics
+import time
+import tracemalloc
+from functools import partial
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.template import engines
+from django.urls import reverse
+from django.test import Client, override_settings
+from django.utils import timezone
+
+from blog import timeline
+from blog.links import fast_reverse
+from blog.models import Category, Follow, Post, TimelineEntry, User
+from blog.views import get_post_cards, get_posts
+
+
+SCENARIOS = {}
+
+
+def scenario(name):
+    def decorator(func):
+        SCENARIOS[name] = func
+        return func
+    return decorator
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def request_cases(client, urls):
+    return [(label, partial(client.get, url)) for label, url in urls]
+
+
+@scenario('api')
+def api_vs_html(client, options):
+    post = get_posts(count_comment=False).first()
+    if post is None:
+        raise CommandError('Нет опубликованных постов для замера.')
+    return request_cases(client, [
+        ('HTML feed', '/'),
+        ('JSON feed', '/api/posts/'),
+        ('HTML category', f'/category/{post.category.slug}/'),
+        ('JSON category', f'/api/category/{post.category.slug}/posts/'),
+        ('HTML profile', f'/profile/{post.author.username}/'),
+        ('JSON profile', f'/api/profile/{post.author.username}/posts/'),
+        ('HTML detail', f'/posts/{post.pk}/'),
+        ('JSON detail', f'/api/posts/{post.pk}/'),
+        ('JSON comments', f'/api/posts/{post.pk}/comments/'),
+    ])
+
+
+@scenario('fanout')
+def fanout_strategies(client, options):
+    users = options['users']
+    author = User.objects.create(username='benchmark-author')
+    category = Category.objects.create(
+        title='Benchmark', description='Benchmark', slug='benchmark'
+    )
+    followers = User.objects.bulk_create(
+        [User(username=f'benchmark-{index}') for index in range(users)],
+        batch_size=5000,
+    )
+    Follow.objects.bulk_create(
+        [Follow(user=follower, author=author) for follower in followers],
+        batch_size=5000,
+    )
+    for index in range(10):
+        Post.objects.create(
+            author=author,
+            category=category,
+            title=f'Benchmark {index}',
+            text='Benchmark',
+            pub_date=timezone.now(),
+        )
+    post = Post.objects.filter(author=author).first()
+    reader = followers[0]
+
+    def fan_out_on_write():
+        TimelineEntry.objects.filter(post=post).delete()
+        timeline.fan_out([post.pk], followers_limit=users)
+
+    def read_page(followers_limit):
+        list(timeline.get_timeline(reader, followers_limit)[:10])
+
+    timeline.fan_out(
+        Post.objects.filter(author=author).values('pk'),
+        followers_limit=users,
+    )
+    return [
+        (f'write x{users}', fan_out_on_write),
+        ('read timeline rows', partial(read_page, users)),
+        ('read on request', partial(read_page, 0)),
+    ]
+
+
+@scenario('session')
+def session_engines(client, options):
+    user = User.objects.filter(is_active=True).first()
+    if user is None:
+        raise CommandError('Нет пользователей для замера.')
+    cases = [('anonymous', partial(client.get, '/'))]
+    for engine in ('db', 'cached_db', 'signed_cookies'):
+        engine_settings = override_settings(
+            SESSION_ENGINE=f'django.contrib.sessions.backends.{engine}'
+        )
+        with engine_settings:
+            # The session middleware binds its engine on the first request.
+            engine_client = Client(SERVER_NAME=options['host'])
+            engine_client.force_login(user)
+            engine_client.get('/')
+        cases.append((
+            f'logged in, {engine}',
+            engine_settings(partial(engine_client.get, '/')),
+        ))
+    return cases
+
+
+def reset_templates():
+    for engine in engines.all():
+        for loader in engine.engine.template_loaders:
+            loader.reset()
+
+
+@scenario('templates')
+def template_loading(client, options):
+    post = get_posts(count_comment=False).first()
+    if post is None:
+        raise CommandError('Нет опубликованных постов для замера.')
+    cases = []
+    for label, url in [
+        ('feed', '/'),
+        ('category', f'/category/{post.category.slug}/'),
+        ('profile', f'/profile/{post.author.username}/'),
+        ('detail', f'/posts/{post.pk}/'),
+    ]:
+        cases.append((
+            f'{label}, cold',
+            lambda url=url: (reset_templates(), client.get(url)),
+        ))
+        cases.append((f'{label}, cached', partial(client.get, url)))
+    return cases
+
+
+@scenario('urls')
+def url_reversal(client, options):
+    links = [
+        ('blog:post_detail', [1]),
+        ('blog:profile', ['author']),
+        ('blog:category_posts', ['travel']),
+        ('blog:edit_comment', [1, 2]),
+    ] * 250
+
+    def resolver():
+        for name, args in links:
+            reverse(name, args=args)
+
+    def precompiled():
+        for name, args in links:
+            fast_reverse(name, *args)
+
+    return [('reverse x1000', resolver), ('fast_reverse x1000', precompiled)]
+
+
+@scenario('columns')
+def column_loading(client, options):
+    page = options['page_size']
+    cases = []
+    for label, posts in [
+        ('all columns', get_posts(filter=False)),
+        ('card columns', get_post_cards(filter=False)),
+    ]:
+        def load(posts=posts):
+            return list(posts[:page])
+
+        tracemalloc.start()
+        load()
+        memory = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+        cases.append((f'{label}, {memory} KiB', load))
+    return cases
+
+
+def unstripped_templates():
+    templates = copy.deepcopy(settings.TEMPLATES)
+    for backend in templates:
+        [(cached, loaders)] = backend['OPTIONS']['loaders']
+        backend['OPTIONS']['loaders'] = [(cached, [
+            'django.template.loaders.filesystem.Loader'
+            if loader == 'blogicum.loaders.Loader' else loader
+            for loader in loaders
+        ])]
+    return override_settings(TEMPLATES=templates)
+
+
+@scenario('compression')
+def response_compression(client, options):
+    with unstripped_templates():
+        unstripped = len(client.get('/').content)
+    cases = []
+    for encoding in ('identity', 'gzip', 'br'):
+        request = partial(client.get, '/', HTTP_ACCEPT_ENCODING=encoding)
+        response = request()
+        if response.get('Content-Encoding', 'identity') != encoding:
+            continue
+        size = f'{len(response.content)} B'
+        if encoding == 'identity':
+            size += f' of {unstripped}'
+        cases.append((f'{encoding}, {size}', request))
+    return cases
+
+
+class Command(BaseCommand):
+    help = 'Measure latency and query counts of Blogicum pages.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenario', choices=sorted(SCENARIOS))
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument('--host', default='localhost')
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=100000,
+            help='Number of followers created for the fanout scenario.'
+        )
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=100,
+            help='Posts loaded per page in the columns scenario.'
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.run(options)
+            transaction.set_rollback(True)
+
+    def run(self, options):
+        client = Client(SERVER_NAME=options['host'])
+        cases = SCENARIOS[options['scenario']](client, options)
+        self.stdout.write(
+            f'{"case":<32}{"mean, ms":>10}{"min, ms":>10}{"queries":>9}'
+        )
+        for label, case in cases:
+            queries = QueryCounter()
+            with connection.execute_wrapper(queries):
+                case()
+            timings = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                case()
+                timings.append((time.perf_counter() - start) * 1000)
+            self.stdout.write(
+                f'{label:<32}{statistics.mean(timings):>10.2f}'
+                f'{min(timings):>10.2f}{queries.count:>9}'
+            )
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from blog.images import IMAGE_BATCH_SIZE, ORPHAN_MIN_AGE, collect_orphans
+
+
+class Command(BaseCommand):
+    help = 'Delete uploaded images that no post refers to.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=ORPHAN_MIN_AGE,
+            help='Keep files modified less than this many seconds ago.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=IMAGE_BATCH_SIZE
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only list the files that would be deleted.'
+        )
+
+    def handle(self, *args, **options):
+        removed = 0
+        for name in collect_orphans(
+            options['min_age'], options['batch_size'], options['dry_run']
+        ):
+            removed += 1
+            if options['verbosity'] > 1 or options['dry_run']:
+                self.stdout.write(name)
+        action = 'Найдено' if options['dry_run'] else 'Удалено'
+        self.stdout.write(self.style.SUCCESS(
+            f'{action} неиспользуемых файлов: {removed}'
+        ))
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.scheduler import next_publication_date, publish_due_posts
+
+
+class Command(BaseCommand):
+    help = 'Publish posts whose publication date has come.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and publish posts as they become due.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=60,
+            help='Maximum number of seconds to sleep between checks.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            published = publish_due_posts()
+            if published:
+                self.stdout.write(f'Опубликовано постов: {len(published)}')
+            if not options['loop']:
+                return
+            time.sleep(self.get_delay(options['interval']))
+
+    def get_delay(self, interval):
+        next_date = next_publication_date()
+        if next_date is None:
+            return interval
+        delay = (next_date - timezone.now()).total_seconds()
+        return min(max(delay, 1), interval)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from blog.feed import recount_counters, refresh_feed
+from blog.models import FeedEntry, Post
+
+
+class Command(BaseCommand):
+    help = 'Resync the denormalized feed table and post counters.'
+
+    def handle(self, *args, **options):
+        refresh_feed(Post.objects.all())
+        recount_counters()
+        self.stdout.write(self.style.SUCCESS(
+            f'Записей в ленте: {FeedEntry.objects.count()}'
+        ))
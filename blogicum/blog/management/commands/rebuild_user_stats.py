@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from blog.stats import STATS_CHUNK_SIZE, rebuild_user_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute post and comment stats of every user.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=STATS_CHUNK_SIZE
+        )
+
+    def handle(self, *args, **options):
+        total = rebuild_user_stats(options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитана статистика пользователей: {total}'
+        ))
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+
+from blog.images import (
+    IMAGE_BATCH_SIZE, ORPHAN_MIN_AGE, batched, get_storage, reconcile,
+    referenced_images, release_images
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare uploaded images with the database: delete files no post '
+        'refers to and list posts whose image file is missing.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=ORPHAN_MIN_AGE,
+            help='Keep files modified less than this many seconds ago.'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only list the files that would be deleted.'
+        )
+
+    def handle(self, *args, **options):
+        storage = get_storage()
+        removed = missing = 0
+        for batch in batched(reconcile(options['min_age']), IMAGE_BATCH_SIZE):
+            orphans = [name for kind, name in batch if kind == 'orphan']
+            if options['dry_run']:
+                orphans = set(orphans) - referenced_images(orphans)
+            else:
+                orphans = release_images(orphans)
+            for name in sorted(orphans):
+                self.stdout.write(name)
+            removed += len(orphans)
+            for kind, name in batch:
+                if kind == 'missing' and not storage.exists(name):
+                    missing += 1
+                    self.stdout.write(self.style.WARNING(
+                        f'Нет файла: {name}'
+                    ))
+        action = 'Найдено' if options['dry_run'] else 'Удалено'
+        self.stdout.write(self.style.SUCCESS(
+            f'{action} неиспользуемых файлов: {removed}, '
+            f'отсутствует файлов: {missing}'
+        ))
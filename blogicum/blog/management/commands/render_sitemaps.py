@@ -0,0 +1,47 @@
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.sitemaps import (
+    SITEMAP_INDEX_NAME,
+    SITEMAPS,
+    render_sitemap_index,
+    render_sitemap_page,
+    sitemap_filename,
+)
+
+
+def write_atomic(path, content):
+    tmp_path = path.with_name(f'.{path.name}.tmp')
+    tmp_path.write_text(content, encoding='utf-8')
+    os.replace(tmp_path, path)
+
+
+class Command(BaseCommand):
+    help = 'Pre-render the sitemap index and its pages to SITEMAP_ROOT.'
+
+    def handle(self, *args, **options):
+        root = Path(settings.SITEMAP_ROOT)
+        root.mkdir(parents=True, exist_ok=True)
+        written = {SITEMAP_INDEX_NAME}
+        num_pages = {}
+        for section, sitemap_class in SITEMAPS.items():
+            sitemap = sitemap_class()
+            num_pages[section] = 0
+            for number, items in enumerate(sitemap.iter_pages(), start=1):
+                filename = sitemap_filename(section, number)
+                write_atomic(
+                    root / filename, render_sitemap_page(sitemap, items)
+                )
+                written.add(filename)
+                num_pages[section] = number
+            self.stdout.write(f'{section}: {num_pages[section]} page(s)')
+        write_atomic(
+            root / SITEMAP_INDEX_NAME, render_sitemap_index(num_pages)
+        )
+        for path in root.glob('sitemap*.xml'):
+            if path.name not in written:
+                path.unlink()
+        self.stdout.write(self.style.SUCCESS(f'Sitemaps written to {root}'))
@@ -0,0 +1,39 @@
+import base64
+import hashlib
+import re
+from urllib.error import URLError
+from urllib.request import urlopen
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django_bootstrap5.core import css_url
+
+from blog.templatetags.assets import BOOTSTRAP_CSS
+
+
+class Command(BaseCommand):
+    help = (
+        'Download the Bootstrap CSS pinned by django-bootstrap5 into '
+        'static/ so that it is served with the other static files.'
+    )
+
+    def handle(self, *args, **options):
+        source = css_url()
+        try:
+            with urlopen(source['url'], timeout=30) as response:
+                content = response.read()
+        except URLError as error:
+            raise CommandError(f'Не удалось скачать {source["url"]}: {error}')
+        algorithm, expected = source['integrity'].split('-', 1)
+        digest = base64.b64encode(
+            hashlib.new(algorithm, content).digest()
+        ).decode()
+        if digest != expected:
+            raise CommandError('Контрольная сумма Bootstrap не совпадает.')
+        # The source map is not vendored; a dangling reference would break
+        # the manifest storage during collectstatic.
+        content = re.sub(rb'/\*# sourceMappingURL=[^*]*\*/', b'', content)
+        target = settings.STATICFILES_DIRS[0] / BOOTSTRAP_CSS
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+        self.stdout.write(self.style.SUCCESS(f'Сохранено: {target}'))
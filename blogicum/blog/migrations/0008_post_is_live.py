@@ -0,0 +1,31 @@
+# Generated by Django 5.1.1 on 2026-10-19 09:44
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def set_is_live(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Post.objects.filter(pub_date__lte=timezone.now()).update(is_live=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_post_comment_admin_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='is_live',
+            field=models.BooleanField(default=False, editable=False, help_text='Выставляется, когда наступает дата публикации.', verbose_name='Вышло в публикацию'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['is_published', 'is_live', 'pub_date'], name='blog_post_is_publ_abe3f8_idx'),
+        ),
+        migrations.RunPython(set_is_live, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.1.1 on 2026-10-19 09:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def fill_feed(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    FeedEntry = apps.get_model('blog', 'FeedEntry')
+    posts = Post.objects.filter(
+        is_published=True,
+        is_live=True,
+        category__is_published=True,
+    ).select_related('author', 'category', 'location').annotate(
+        comment_count=Count('comments', filter=Q(comments__is_published=True))
+    )
+    entries = []
+    for post in posts.iterator(chunk_size=1000):
+        entries.append(FeedEntry(
+            post_id=post.pk,
+            pub_date=post.pub_date,
+            author_id=post.author_id,
+            category_id=post.category_id,
+            location_id=post.location_id,
+            title=post.title,
+            text=post.text,
+            image=post.image.name or '',
+            author_username=post.author.username,
+            category_title=post.category.title,
+            category_slug=post.category.slug,
+            location_name=(
+                post.location.name
+                if post.location and post.location.is_published else None
+            ),
+            comment_count=post.comment_count,
+        ))
+        if len(entries) == 1000:
+            FeedEntry.objects.bulk_create(entries)
+            entries = []
+    FeedEntry.objects.bulk_create(entries)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_post_is_live'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='feed_entry', serialize=False, to='blog.post')),
+                ('pub_date', models.DateTimeField()),
+                ('title', models.CharField(max_length=256)),
+                ('text', models.TextField()),
+                ('image', models.CharField(blank=True, max_length=100)),
+                ('author_username', models.CharField(max_length=150)),
+                ('category_title', models.CharField(max_length=256)),
+                ('category_slug', models.SlugField()),
+                ('location_name', models.CharField(max_length=256, null=True)),
+                ('comment_count', models.PositiveIntegerField(default=0)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='blog.category')),
+                ('location', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to='blog.location')),
+            ],
+            options={
+                'verbose_name': 'запись ленты',
+                'verbose_name_plural': 'Лента',
+                'ordering': ('-pub_date',),
+                'default_related_name': 'feed_entries',
+                'indexes': [models.Index(fields=['-pub_date'], name='blog_feeden_pub_dat_a5f988_idx'), models.Index(fields=['category', '-pub_date'], name='blog_feeden_categor_8f56be_idx'), models.Index(fields=['author', '-pub_date'], name='blog_feeden_author__00e8fa_idx')],
+            },
+        ),
+        migrations.RunPython(fill_feed, migrations.RunPython.noop),
+    ]
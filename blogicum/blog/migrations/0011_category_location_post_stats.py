@@ -0,0 +1,51 @@
+# Generated by Django 5.1.1 on 2026-10-19 09:55
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_posts(apps, schema_editor):
+    FeedEntry = apps.get_model('blog', 'FeedEntry')
+    for name in ('category', 'location'):
+        entries = FeedEntry.objects.filter(**{name: OuterRef('pk')})
+        apps.get_model('blog', name).objects.update(
+            posts_count=Coalesce(Subquery(
+                entries.order_by().values(name)
+                .annotate(count=Count('pk')).values('count')
+            ), 0),
+            last_published_at=Subquery(
+                entries.order_by('-pub_date').values('pub_date')[:1]
+            ),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_follow_timelineentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='last_published_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Последняя публикация'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Опубликовано постов'),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='last_published_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Последняя публикация'),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Опубликовано постов'),
+        ),
+        migrations.RunPython(count_posts, migrations.RunPython.noop),
+    ]
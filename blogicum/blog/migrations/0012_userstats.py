@@ -0,0 +1,70 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+
+def fill_stats(apps, schema_editor):
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    UserStats = apps.get_model('blog', 'UserStats')
+
+    def aggregate(model, function, **filters):
+        return Subquery(
+            apps.get_model('blog', model).objects
+            .filter(author=OuterRef('pk'), **filters).order_by()
+            .values('author').annotate(value=function).values('value')
+        )
+
+    last_post = aggregate('Post', Max('created_at'))
+    last_comment = aggregate('Comment', Max('created_at'))
+    users = User.objects.annotate(
+        stats_posts=Coalesce(aggregate('FeedEntry', Count('pk')), 0),
+        stats_comments=Coalesce(
+            aggregate('Comment', Count('pk'), is_published=True), 0
+        ),
+        stats_activity=Greatest(
+            Coalesce(last_post, last_comment),
+            Coalesce(last_comment, last_post)
+        ),
+    ).values_list('pk', 'stats_posts', 'stats_comments', 'stats_activity')
+    UserStats.objects.bulk_create(
+        [
+            UserStats(
+                user_id=pk,
+                posts_count=posts_count,
+                comments_count=comments_count,
+                last_activity_at=last_activity_at,
+            )
+            for pk, posts_count, comments_count, last_activity_at
+            in users.iterator(chunk_size=1000)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('blog', '0011_category_location_post_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+                ('posts_count', models.PositiveIntegerField(default=0, verbose_name='Опубликовано постов')),
+                ('comments_count', models.PositiveIntegerField(default=0, verbose_name='Опубликовано комментариев')),
+                ('last_activity_at', models.DateTimeField(blank=True, null=True, verbose_name='Последняя активность')),
+            ],
+            options={
+                'verbose_name': 'статистика пользователя',
+                'verbose_name_plural': 'Статистика пользователей',
+            },
+        ),
+        migrations.RunPython(fill_stats, migrations.RunPython.noop),
+    ]
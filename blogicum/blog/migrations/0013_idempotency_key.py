@@ -0,0 +1,33 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_userstats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='idempotency_key',
+            field=models.UUIDField(blank=True, editable=False, null=True, verbose_name='Ключ идемпотентности'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='idempotency_key',
+            field=models.UUIDField(blank=True, editable=False, null=True, verbose_name='Ключ идемпотентности'),
+        ),
+        migrations.AddConstraint(
+            model_name='comment',
+            constraint=models.UniqueConstraint(fields=('author', 'idempotency_key'), name='unique_comment_idempotency_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='post',
+            constraint=models.UniqueConstraint(fields=('author', 'idempotency_key'), name='unique_post_idempotency_key'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.1 on 2026-10-19 12:10
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+from blog.excerpts import make_excerpt
+
+
+def fill_excerpts(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    FeedEntry = apps.get_model('blog', 'FeedEntry')
+    posts = []
+    for post in Post.objects.only('pk', 'text').iterator(chunk_size=1000):
+        post.excerpt = make_excerpt(post.text)
+        posts.append(post)
+        if len(posts) == 1000:
+            Post.objects.bulk_update(posts, ['excerpt'])
+            posts = []
+    Post.objects.bulk_update(posts, ['excerpt'])
+    FeedEntry.objects.update(excerpt=Subquery(
+        Post.objects.filter(pk=OuterRef('post')).values('excerpt')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, verbose_name='Начало текста'),
+        ),
+        migrations.RenameField(
+            model_name='feedentry',
+            old_name='text',
+            new_name='excerpt',
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
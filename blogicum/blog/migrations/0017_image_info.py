@@ -0,0 +1,62 @@
+# Generated by Django 5.1.1 on 2026-10-19 11:16
+
+from django.db import migrations, models
+
+
+def copy_image_info(apps, schema_editor):
+    ImageInfo = apps.get_model('blog', 'ImageInfo')
+    Post = apps.get_model('blog', 'Post')
+    rows = Post.objects.exclude(image='').filter(
+        image_width__isnull=False, image_height__isnull=False
+    ).exclude(image_color='').values_list(
+        'image', 'image_width', 'image_height', 'image_color'
+    ).distinct()
+    ImageInfo.objects.bulk_create(
+        (
+            ImageInfo(name=name, width=width, height=height, color=color)
+            for name, width, height, color in rows.iterator()
+        ),
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_image_dimensions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageInfo',
+            fields=[
+                ('name', models.CharField(max_length=100, primary_key=True, serialize=False, verbose_name='Файл')),
+                ('width', models.PositiveIntegerField(verbose_name='Ширина')),
+                ('height', models.PositiveIntegerField(verbose_name='Высота')),
+                ('color', models.CharField(max_length=7, verbose_name='Цвет заглушки')),
+            ],
+            options={
+                'verbose_name': 'сведения об изображении',
+                'verbose_name_plural': 'Сведения об изображениях',
+            },
+        ),
+        migrations.RunPython(copy_image_info, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='post',
+            name='image_color',
+        ),
+        migrations.RemoveField(
+            model_name='post',
+            name='image_height',
+        ),
+        migrations.RemoveField(
+            model_name='post',
+            name='image_width',
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(blank=True, db_index=True, upload_to='posts_images', verbose_name='Фото'),
+        ),
+    ]
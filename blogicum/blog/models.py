@@ -1,5 +1,11 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models.query import ModelIterable
+from django.utils import timezone
+
+from .excerpts import make_excerpt
+from .links import fast_reverse
+from .placeholders import read_image
 
 
 User = get_user_model()
@@ -20,7 +26,35 @@ class CreatePublished(models.Model):
         abstract = True
 
 
-class Category(CreatePublished):
+class PostStats(models.Model):
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Опубликовано постов'
+    )
+    last_published_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Последняя публикация'
+    )
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        # Counters are maintained by blog.feed with F() updates; a plain
+        # save of a stale instance must not overwrite them.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in ('posts_count', 'last_published_at')
+            ]
+        super().save(*args, **kwargs)
+
+
+class Category(CreatePublished, PostStats):
     title = models.CharField(
         max_length=256,
         verbose_name='Заголовок'
@@ -41,6 +75,12 @@ class Category(CreatePublished):
         ordering = ('title',)
 
     def __str__(self):
+        return self.title[:100]
+
+    def get_absolute_url(self):
+        return fast_reverse('blog:category_posts', self.slug)
+
+    def describe(self):
         return (
             f'{self.title[:100]}'
             f'{self.description[:100]}'
@@ -48,7 +88,7 @@ class Category(CreatePublished):
         )
 
 
-class Location(CreatePublished):
+class Location(CreatePublished, PostStats):
     name = models.CharField(
         max_length=256,
         blank=True,
@@ -64,6 +104,37 @@ class Location(CreatePublished):
         return self.name[:100]
 
 
+class ImageInfo(models.Model):
+    """Dimensions and placeholder colour of a stored post image.
+
+    Uploads are named by the hash of their bytes, so one row serves every
+    post sharing the file and is read from it only once.
+    """
+
+    name = models.CharField(
+        max_length=100,
+        primary_key=True,
+        verbose_name='Файл'
+    )
+    width = models.PositiveIntegerField(
+        verbose_name='Ширина'
+    )
+    height = models.PositiveIntegerField(
+        verbose_name='Высота'
+    )
+    color = models.CharField(
+        max_length=7,
+        verbose_name='Цвет заглушки'
+    )
+
+    class Meta:
+        verbose_name = 'сведения об изображении'
+        verbose_name_plural = 'Сведения об изображениях'
+
+    def __str__(self):
+        return self.name
+
+
 class Post(CreatePublished):
     title = models.CharField(
         max_length=256,
@@ -72,7 +143,13 @@ class Post(CreatePublished):
     text = models.TextField(
         verbose_name='Текст'
     )
+    excerpt = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name='Начало текста'
+    )
     pub_date = models.DateTimeField(
+        db_index=True,
         verbose_name='Дата и время публикации',
         help_text='Если установить дату и время в будущем — '
                   'можно делать отложенные публикации.'
@@ -80,7 +157,15 @@ class Post(CreatePublished):
     image = models.ImageField(
         'Фото',
         upload_to='posts_images',
-        blank=True
+        blank=True,
+        # Files are shared between posts and released by reference count.
+        db_index=True
+    )
+    is_live = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Вышло в публикацию',
+        help_text='Выставляется, когда наступает дата публикации.'
     )
 
     author = models.ForeignKey(
@@ -102,21 +187,79 @@ class Post(CreatePublished):
         null=True,
         verbose_name='Категория',
     )
+    idempotency_key = models.UUIDField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Ключ идемпотентности',
+    )
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         default_related_name = 'posts'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(fields=('is_published', 'pub_date')),
+            models.Index(fields=('is_published', 'is_live', 'pub_date')),
+        )
+        constraints = (
+            models.UniqueConstraint(
+                fields=('author', 'idempotency_key'),
+                name='unique_post_idempotency_key',
+            ),
+        )
 
     def __str__(self):
+        return self.title[:100]
+
+    def get_absolute_url(self):
+        return fast_reverse('blog:post_detail', self.pk)
+
+    def get_author_url(self):
+        return fast_reverse('blog:profile', self.author.username)
+
+    def save(self, *args, **kwargs):
+        self.is_live = self.pub_date <= timezone.now()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'text' in update_fields:
+            self.excerpt = make_excerpt(self.text)
+        if update_fields is None or 'image' in update_fields:
+            self.store_image()
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'is_live'}
+            if 'text' in update_fields:
+                kwargs['update_fields'].add('excerpt')
+        super().save(*args, **kwargs)
+
+    def store_image(self):
+        """Commit a newly assigned image and record its ImageInfo.
+
+        The file is saved here rather than by the field's pre_save, so its
+        content-hash name is known, and its info stored, before post_save
+        copies the post into the feed.
+        """
+        image = self.image
+        if not image or image._committed:
+            return
+        try:
+            width, height, color = read_image(image)
+        except OSError:
+            width = None
+        image.save(image.name, image.file, save=False)
+        if width is not None:
+            ImageInfo.objects.get_or_create(name=image.name, defaults={
+                'width': width, 'height': height, 'color': color
+            })
+
+    def describe(self):
         return (
             f'{self.title[:100]}'
             f'{self.text[:100]}'
             f'{self.pub_date}'
             f'{self.author}'
             f'{self.location}'
-            f'{self.category}'
+            f'{self.category.describe() if self.category else None}'
         )
 
 
@@ -133,9 +276,247 @@ class Comment(CreatePublished):
         on_delete=models.CASCADE,
         verbose_name='Автор публикации',
     )
+    idempotency_key = models.UUIDField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Ключ идемпотентности',
+    )
 
     class Meta:
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
         ordering = ('text',)
+        indexes = (
+            models.Index(fields=('is_published', 'created_at')),
+        )
+        constraints = (
+            models.UniqueConstraint(
+                fields=('author', 'idempotency_key'),
+                name='unique_comment_idempotency_key',
+            ),
+        )
+
+    def __str__(self):
+        return self.text[:50]
+
+    def get_author_url(self):
+        return fast_reverse('blog:profile', self.author.username)
+
+    def get_edit_url(self):
+        return fast_reverse('blog:edit_comment', self.post_id, self.pk)
+
+    def get_delete_url(self):
+        return fast_reverse('blog:delete_comment', self.post_id, self.pk)
+
+
+class FeedPostIterable(ModelIterable):
+    def __iter__(self):
+        for entry in super().__iter__():
+            yield entry.as_post()
+
+
+class FeedEntryQuerySet(models.QuerySet):
+    def as_posts(self):
+        clone = self._chain()
+        clone._iterable_class = FeedPostIterable
+        return clone
+
+
+class FeedEntry(models.Model):
+    """Denormalized copy of a currently visible post for feed pages.
+
+    Only the excerpt of the text is kept: posts built by as_post() are
+    meant for cards, not for the detail page.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='feed_entry',
+    )
+    pub_date = models.DateTimeField()
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+    )
+    location = models.ForeignKey(
+        Location,
+        on_delete=models.SET_NULL,
+        null=True,
+    )
+    title = models.CharField(max_length=256)
+    excerpt = models.TextField()
+    image = models.CharField(max_length=100, blank=True)
+    image_width = models.PositiveIntegerField(null=True)
+    image_height = models.PositiveIntegerField(null=True)
+    image_color = models.CharField(max_length=7, blank=True)
+    author_username = models.CharField(max_length=150)
+    category_title = models.CharField(max_length=256)
+    category_slug = models.SlugField()
+    location_name = models.CharField(max_length=256, null=True)
+    comment_count = models.PositiveIntegerField(default=0)
+
+    objects = FeedEntryQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'запись ленты'
+        verbose_name_plural = 'Лента'
+        default_related_name = 'feed_entries'
+        ordering = ('-pub_date',)
+        indexes = (
+            models.Index(fields=('-pub_date',)),
+            models.Index(fields=('category', '-pub_date')),
+            models.Index(fields=('author', '-pub_date')),
+        )
+
+    def __str__(self):
+        return self.title[:100]
+
+    def get_absolute_url(self):
+        return fast_reverse('blog:post_detail', self.post_id)
+
+    def as_post(self):
+        post = Post(
+            id=self.post_id,
+            title=self.title,
+            excerpt=self.excerpt,
+            pub_date=self.pub_date,
+            image=self.image,
+            is_published=True,
+            is_live=True,
+        )
+        post.image_width = self.image_width
+        post.image_height = self.image_height
+        post.image_color = self.image_color
+        post.author = User(id=self.author_id, username=self.author_username)
+        post.category = Category(
+            id=self.category_id,
+            title=self.category_title,
+            slug=self.category_slug,
+            is_published=True,
+        )
+        if self.location_name is not None:
+            post.location = Location(
+                id=self.location_id,
+                name=self.location_name,
+                is_published=True,
+            )
+        post.comment_count = self.comment_count
+        return post
+
+
+class Follow(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='follows',
+        verbose_name='Подписчик',
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='followers',
+        verbose_name='Автор',
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='followers',
+        verbose_name='Категория',
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено'
+    )
+
+    class Meta:
+        verbose_name = 'подписка'
+        verbose_name_plural = 'Подписки'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'author'), name='unique_author_follow'
+            ),
+            models.UniqueConstraint(
+                fields=('user', 'category'), name='unique_category_follow'
+            ),
+            models.CheckConstraint(
+                condition=(
+                    models.Q(author__isnull=True, category__isnull=False)
+                    | models.Q(author__isnull=False, category__isnull=True)
+                ),
+                name='follow_author_or_category',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.user_id} → {self.author_id or self.category_id}'
+
+
+class TimelineEntry(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='timeline',
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='timeline_entries',
+    )
+    pub_date = models.DateTimeField()
+
+    class Meta:
+        verbose_name = 'запись персональной ленты'
+        verbose_name_plural = 'Персональные ленты'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'post'), name='unique_timeline_post'
+            ),
+        )
+        indexes = (
+            models.Index(fields=('user', '-pub_date')),
+        )
+
+    def __str__(self):
+        return f'{self.user_id}: {self.post_id}'
+
+
+class UserStats(models.Model):
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Пользователь',
+    )
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Опубликовано постов'
+    )
+    comments_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Опубликовано комментариев'
+    )
+    last_activity_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Последняя активность'
+    )
+
+    class Meta:
+        verbose_name = 'статистика пользователя'
+        verbose_name_plural = 'Статистика пользователей'
+
+    def __str__(self):
+        return str(self.user_id)
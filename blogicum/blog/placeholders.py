@@ -0,0 +1,24 @@
+from PIL import Image
+
+
+# JPEGs are decoded at a reduced scale close to this size.
+PLACEHOLDER_SAMPLE = (64, 64)
+
+
+def read_image(file):
+    """Width, height and average colour as #rrggbb of an image file.
+
+    The colour fills the <img> box while the picture itself loads.
+    Raises OSError if the file can't be read as an image.
+    """
+    file.seek(0)
+    try:
+        with Image.open(file) as image:
+            width, height = image.size
+            image.draft('RGB', PLACEHOLDER_SAMPLE)
+            red, green, blue = image.convert('RGB').resize(
+                (1, 1), Image.Resampling.BOX
+            ).getpixel((0, 0))
+    finally:
+        file.seek(0)
+    return width, height, f'#{red:02x}{green:02x}{blue:02x}'
@@ -0,0 +1,66 @@
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.shortcuts import render
+
+
+LOCK_TIMEOUT = 1
+LOCK_ATTEMPTS = 20
+LOCK_DELAY = 0.01
+
+
+def take_token(key, capacity, interval):
+    """Take a token from a bucket; return seconds to wait, 0 if taken.
+
+    The read-modify-write runs under a lock made with cache.add(), which
+    is atomic in the local-memory and database backends.
+    """
+    cache = caches[settings.RATELIMIT_CACHE]
+    lock = f'{key}:lock'
+    for _ in range(LOCK_ATTEMPTS):
+        if cache.add(lock, True, LOCK_TIMEOUT):
+            break
+        time.sleep(LOCK_DELAY)
+    else:
+        return interval
+    try:
+        now = time.time()
+        tokens, updated = cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) / interval)
+        if tokens < 1:
+            return (1 - tokens) * interval
+        cache.set(key, (tokens - 1, now), capacity * interval)
+        return 0
+    finally:
+        cache.delete(lock)
+
+
+def get_retry_after(request, scope):
+    """Seconds the client has to wait before writing to `scope` again."""
+    limits = settings.RATELIMITS.get(scope) or {}
+    clients = {'ip': request.META.get('REMOTE_ADDR')}
+    if request.user.is_authenticated:
+        clients['user'] = request.user.pk
+    for kind in ('user', 'ip'):
+        if limits.get(kind) is None or kind not in clients:
+            continue
+        wait = take_token(
+            f'blog:ratelimit:{scope}:{kind}:{clients[kind]}', *limits[kind]
+        )
+        if wait:
+            return wait
+    return 0
+
+
+class RateLimitMixin:
+    ratelimit_scope = None
+
+    def post(self, request, *args, **kwargs):
+        retry_after = get_retry_after(request, self.ratelimit_scope)
+        if retry_after:
+            response = render(request, 'pages/429.html', status=429)
+            response['Retry-After'] = math.ceil(retry_after)
+            return response
+        return super().post(request, *args, **kwargs)
@@ -0,0 +1,48 @@
+from django.db import transaction
+from django.utils import timezone
+
+from .feed import sync_posts
+from .models import Post
+from .signals import post_published
+
+
+PUBLISH_BATCH_SIZE = 1000
+
+
+def publish_due_posts(now=None, batch_size=PUBLISH_BATCH_SIZE):
+    """Flip is_live for posts whose pub_date has come, batch by batch.
+
+    Returns the ids of every flipped post. post_published is an extension
+    hook for code outside the app: like post_saved(), it is sent only with
+    the posts that entered the feed, since unpublished posts and posts in
+    hidden categories stay out of it. The feed, its timelines, counters and
+    cached pages are updated by sync_posts() itself.
+    """
+    now = now or timezone.now()
+    published = []
+    added = []
+    while True:
+        with transaction.atomic():
+            ids = list(
+                Post.objects.select_for_update(skip_locked=True)
+                .filter(is_live=False, pub_date__lte=now)
+                .order_by('pub_date')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            Post.objects.filter(pk__in=ids).update(is_live=True)
+            added.extend(sync_posts(ids))
+        published.extend(ids)
+    if added:
+        post_published.send(sender=Post, post_ids=added)
+    return published
+
+
+def next_publication_date():
+    return (
+        Post.objects.filter(is_live=False)
+        .order_by('pub_date')
+        .values_list('pub_date', flat=True)
+        .first()
+    )
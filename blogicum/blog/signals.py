@@ -0,0 +1,152 @@
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import Signal, receiver
+
+from .cache import invalidate_choices, invalidate_on_commit
+from .feed import (
+    get_places, refresh_feed, sync_posts, update_comment_counts,
+    update_counters
+)
+from .images import release_on_commit
+from .models import Category, Comment, FeedEntry, Location, Post, User
+from .stats import update_user_stats
+
+
+# Extension hook: sent with the ids of posts that entered the feed. Nothing
+# in the app listens to it.
+post_published = Signal()
+
+
+# Posts invalidate cached content from feed.sync_posts() and
+# post_deleted(), when their visibility changes.
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def content_changed(**kwargs):
+    invalidate_on_commit()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def choices_changed(sender, **kwargs):
+    invalidate_choices(sender)
+
+
+@receiver(post_save, sender=Post)
+def post_saved(instance, raw=False, **kwargs):
+    if raw:
+        return
+    added = sync_posts([instance.pk])
+    if added:
+        post_published.send(sender=Post, post_ids=added)
+
+
+@receiver(pre_save, sender=Post)
+def post_saving(instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance._state.adding:
+        return
+    if update_fields is None or 'image' in update_fields:
+        instance._stored_image = Post.objects.filter(
+            pk=instance.pk
+        ).values_list('image', flat=True).first()
+
+
+@receiver(post_save, sender=Post)
+def post_image_replaced(instance, **kwargs):
+    stored = getattr(instance, '_stored_image', None)
+    if stored and stored != instance.image.name:
+        release_on_commit([stored])
+    instance._stored_image = None
+
+
+@receiver(pre_delete, sender=Post)
+def post_deleting(instance, **kwargs):
+    instance._places = get_places([instance.pk])
+
+
+def deleting_user(origin):
+    """Whether a delete cascades from users, whose stats go away too."""
+    return issubclass(getattr(origin, 'model', type(origin)), User)
+
+
+def author_changed(instance, origin):
+    """Update stats of the author, after the users if they are deleted.
+
+    The stats of the deleted users must not be written back while their
+    rows are removed, so authors touched by such a cascade are collected
+    on the origin and updated by user_deleted().
+    """
+    if deleting_user(origin):
+        origin._stale_authors = {
+            *getattr(origin, '_stale_authors', ()), instance.author_id
+        }
+    else:
+        update_user_stats([instance.author_id])
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(instance, origin=None, **kwargs):
+    places = getattr(instance, '_places', {})
+    update_counters(places, {})
+    if places:
+        invalidate_on_commit()
+    release_on_commit([instance.image.name])
+    author_changed(instance, origin)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(origin=None, **kwargs):
+    author_ids = getattr(origin, '_stale_authors', None)
+    if author_ids:
+        origin._stale_authors = set()
+        update_user_stats(author_ids)
+
+
+@receiver(post_save, sender=Category)
+def category_saved(instance, **kwargs):
+    refresh_feed(instance.posts.all())
+
+
+@receiver(pre_delete, sender=Category)
+def category_deleting(instance, **kwargs):
+    # Posts are detached with a queryset update that sends no signals.
+    entries = FeedEntry.objects.filter(category=instance)
+    instance._places = get_places(entries.values('post_id'))
+    instance._authors = list(
+        entries.order_by().values_list('author', flat=True).distinct()
+    )
+
+
+@receiver(post_delete, sender=Category)
+def category_deleted(instance, **kwargs):
+    update_counters(getattr(instance, '_places', {}), {})
+    update_user_stats(getattr(instance, '_authors', []))
+
+
+@receiver(post_save, sender=Location)
+def location_saved(instance, **kwargs):
+    FeedEntry.objects.filter(location=instance).update(
+        location_name=instance.name if instance.is_published else None
+    )
+
+
+@receiver(pre_delete, sender=Location)
+def location_deleted(instance, **kwargs):
+    FeedEntry.objects.filter(location=instance).update(location_name=None)
+
+
+@receiver(post_save, sender=User)
+def user_saved(instance, update_fields=None, **kwargs):
+    if update_fields is None or 'username' in update_fields:
+        FeedEntry.objects.filter(author=instance).update(
+            author_username=instance.username
+        )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(instance, origin=None, **kwargs):
+    update_comment_counts([instance.post_id])
+    author_changed(instance, origin)
@@ -0,0 +1,227 @@
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.sitemaps import Sitemap
+from django.core.cache import cache
+from django.http import FileResponse, Http404, HttpResponse
+from django.template.loader import render_to_string
+from django.urls import reverse
+
+from .cache import content_cache_key
+from .models import Category, User
+from .views import get_posts
+
+
+SITEMAP_INDEX_NAME = 'sitemap.xml'
+
+
+@dataclass
+class SitemapIndexItem:
+    location: str
+    last_mod: datetime = None
+
+
+class ChunkedSitemap(Sitemap):
+    """Sitemap paginated by primary key instead of OFFSET."""
+
+    protocol = 'https'
+    changefreq = None
+    priority = None
+
+    @property
+    def limit(self):
+        return settings.SITEMAP_PAGE_SIZE
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def items(self):
+        return self.get_queryset().order_by('pk')
+
+    def lastmod(self, item):
+        return None
+
+    def iter_pages(self):
+        items = self.items()
+        last_pk = 0
+        while True:
+            page = list(items.filter(pk__gt=last_pk)[:self.limit])
+            if not page:
+                return
+            last_pk = page[-1].pk
+            yield page
+
+    def find_page_starts(self):
+        """The pk after which each page starts.
+
+        Every step skips at most one page of the pk index from the last
+        boundary, so no query scans from the start of the table.
+        """
+        pks = self.items().values_list('pk', flat=True)
+        starts = []
+        last_pk = 0
+        while pks.filter(pk__gt=last_pk).exists():
+            starts.append(last_pk)
+            last_pk = next(iter(
+                pks.filter(pk__gt=last_pk)[self.limit - 1:self.limit]
+            ), None)
+            if last_pk is None:
+                break
+        return starts
+
+    def get_page_starts(self):
+        return cache.get_or_set(
+            content_cache_key(
+                'sitemap', type(self).__name__, 'starts', self.limit
+            ),
+            self.find_page_starts,
+            settings.SITEMAP_CACHE_TIMEOUT
+        )
+
+    def get_page(self, number):
+        starts = self.get_page_starts()
+        if not 1 <= number <= len(starts):
+            return []
+        return list(
+            self.items().filter(pk__gt=starts[number - 1])[:self.limit]
+        )
+
+    def get_num_pages(self):
+        return len(self.get_page_starts())
+
+    def get_urlset(self, items):
+        return [
+            {
+                'location': absolute_url(self.location(item), self.protocol),
+                'lastmod': self.lastmod(item),
+                'changefreq': self.changefreq,
+                'priority': self.priority,
+            }
+            for item in items
+        ]
+
+
+class PostSitemap(ChunkedSitemap):
+    changefreq = 'weekly'
+
+    def get_queryset(self):
+        return get_posts(
+            select_related=False, count_comment=False
+        ).only('pk', 'pub_date')
+
+    def location(self, item):
+        return item.get_absolute_url()
+
+    def lastmod(self, item):
+        return item.pub_date
+
+
+class CategorySitemap(ChunkedSitemap):
+    changefreq = 'daily'
+
+    def get_queryset(self):
+        return Category.objects.filter(is_published=True).only(
+            'pk', 'slug', 'last_published_at'
+        )
+
+    def location(self, item):
+        return item.get_absolute_url()
+
+    def lastmod(self, item):
+        return item.last_published_at
+
+
+class ProfileSitemap(ChunkedSitemap):
+    changefreq = 'weekly'
+
+    def get_queryset(self):
+        return User.objects.filter(is_active=True).only('pk', 'username')
+
+    def location(self, item):
+        return reverse('blog:profile', args=[item.username])
+
+
+SITEMAPS = {
+    'posts': PostSitemap,
+    'categories': CategorySitemap,
+    'profiles': ProfileSitemap,
+}
+
+
+def absolute_url(path, protocol='https'):
+    return f'{protocol}://{settings.SITEMAP_DOMAIN}{path}'
+
+
+def sitemap_filename(section, number):
+    return f'sitemap-{section}-{number}.xml'
+
+
+def render_sitemap_index(num_pages):
+    return render_to_string('sitemap_index.xml', {
+        'sitemaps': [
+            SitemapIndexItem(absolute_url(reverse(
+                'blog:sitemap_section',
+                kwargs={'section': section, 'page': number}
+            )))
+            for section, pages in num_pages.items()
+            for number in range(1, pages + 1)
+        ]
+    })
+
+
+def render_sitemap_page(sitemap, items):
+    return render_to_string('sitemap.xml', {
+        'urlset': sitemap.get_urlset(items)
+    })
+
+
+def get_sitemap_index():
+    return cache.get_or_set(
+        content_cache_key('sitemap', 'index'),
+        lambda: render_sitemap_index({
+            section: sitemap().get_num_pages()
+            for section, sitemap in SITEMAPS.items()
+        }),
+        settings.SITEMAP_CACHE_TIMEOUT
+    )
+
+
+def get_sitemap_page(section, number):
+    def render():
+        sitemap = SITEMAPS[section]()
+        items = sitemap.get_page(number)
+        return render_sitemap_page(sitemap, items) if items else None
+
+    key = content_cache_key('sitemap', section, number)
+    content = cache.get(key)
+    if content is None:
+        content = render()
+        cache.set(key, content or '', settings.SITEMAP_CACHE_TIMEOUT)
+    return content or None
+
+
+def serve_sitemap(filename, render):
+    path = Path(settings.SITEMAP_ROOT) / filename
+    if path.is_file():
+        return FileResponse(
+            open(path, 'rb'), content_type='application/xml'
+        )
+    content = render()
+    if content is None:
+        raise Http404
+    return HttpResponse(content, content_type='application/xml')
+
+
+def sitemap_index(request):
+    return serve_sitemap(SITEMAP_INDEX_NAME, get_sitemap_index)
+
+
+def sitemap_section(request, section, page):
+    if section not in SITEMAPS or page < 1:
+        raise Http404
+    return serve_sitemap(
+        sitemap_filename(section, page),
+        lambda: get_sitemap_page(section, page)
+    )
@@ -0,0 +1,62 @@
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Comment, FeedEntry, Post, User, UserStats
+
+
+STATS_CHUNK_SIZE = 1000
+
+
+def aggregate(queryset, function):
+    return Subquery(
+        queryset.filter(author=OuterRef('pk')).order_by().values('author')
+        .annotate(value=function).values('value')
+    )
+
+
+def update_user_stats(user_ids):
+    """Recompute the stats rows of the given users from indexed columns."""
+    last_post = aggregate(Post.objects.all(), Max('created_at'))
+    last_comment = aggregate(Comment.objects.all(), Max('created_at'))
+    rows = User.objects.filter(pk__in=user_ids).annotate(
+        stats_posts=Coalesce(
+            aggregate(FeedEntry.objects.all(), Count('pk')), 0
+        ),
+        stats_comments=Coalesce(
+            aggregate(Comment.objects.filter(is_published=True), Count('pk')),
+            0
+        ),
+        # Greatest() is NULL if any argument is NULL on some backends.
+        stats_activity=Greatest(
+            Coalesce(last_post, last_comment),
+            Coalesce(last_comment, last_post)
+        ),
+    ).values_list('pk', 'stats_posts', 'stats_comments', 'stats_activity')
+    UserStats.objects.bulk_create(
+        [
+            UserStats(
+                user_id=pk,
+                posts_count=posts_count,
+                comments_count=comments_count,
+                last_activity_at=last_activity_at,
+            )
+            for pk, posts_count, comments_count, last_activity_at in rows
+        ],
+        update_conflicts=True,
+        unique_fields=('user',),
+        update_fields=('posts_count', 'comments_count', 'last_activity_at'),
+    )
+
+
+def rebuild_user_stats(chunk_size=STATS_CHUNK_SIZE):
+    """Recompute stats of every user, chunk by chunk; return users done."""
+    user_ids = User.objects.order_by('pk').values_list('pk', flat=True)
+    last_pk = 0
+    total = 0
+    while True:
+        chunk = list(user_ids.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return total
+        update_user_stats(chunk)
+        total += len(chunk)
+        last_pk = chunk[-1]
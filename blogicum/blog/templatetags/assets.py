@@ -0,0 +1,26 @@
+from functools import cache
+
+from django import template
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from django.utils.html import format_html
+from django_bootstrap5.templatetags.django_bootstrap5 import bootstrap_css
+
+register = template.Library()
+
+BOOTSTRAP_CSS = 'vendor/bootstrap/css/bootstrap.min.css'
+
+
+@cache
+def is_vendored(path):
+    return finders.find(path) is not None
+
+
+@register.simple_tag
+def bootstrap_stylesheet():
+    """Self-hosted Bootstrap CSS, or the CDN link until it is vendored."""
+    if not is_vendored(BOOTSTRAP_CSS):
+        return bootstrap_css()
+    return format_html(
+        '<link rel="stylesheet" href="{}">', static(BOOTSTRAP_CSS)
+    )
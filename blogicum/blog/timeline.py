@@ -0,0 +1,131 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+
+from .models import FeedEntry, Follow, TimelineEntry
+
+
+TIMELINE_LENGTH = 500
+FANOUT_FOLLOWERS_LIMIT = 10000
+FANOUT_BATCH_SIZE = 1000
+POPULARITY_CACHE_TIMEOUT = 10 * 60
+
+
+def is_popular(followers_limit=None, **source):
+    """Whether `source` has too many followers to fan out on write."""
+    [(kind, pk)] = source.items()
+    if followers_limit is None:
+        followers_limit = FANOUT_FOLLOWERS_LIMIT
+
+    def count():
+        followers = Follow.objects.filter(**source)[:followers_limit + 1]
+        return followers.count() > followers_limit
+
+    return cache.get_or_set(
+        f'blog:popular:{kind}:{pk}:{followers_limit}',
+        count,
+        POPULARITY_CACHE_TIMEOUT
+    )
+
+
+def trim_timelines(user_ids):
+    ranked = TimelineEntry.objects.filter(user_id__in=user_ids).annotate(
+        rank=Window(
+            RowNumber(),
+            partition_by=F('user'),
+            order_by=F('pub_date').desc(),
+        )
+    )
+    stale = list(
+        ranked.filter(rank__gt=TIMELINE_LENGTH).values_list('pk', flat=True)
+    )
+    TimelineEntry.objects.filter(pk__in=stale).delete()
+
+
+def push(entries, follows):
+    """Copy feed `entries` into the timelines of `follows`' users."""
+    user_ids = list(follows.order_by().values_list('user', flat=True))
+    for start in range(0, len(user_ids), FANOUT_BATCH_SIZE):
+        batch = user_ids[start:start + FANOUT_BATCH_SIZE]
+        with transaction.atomic():
+            TimelineEntry.objects.bulk_create(
+                [
+                    TimelineEntry(
+                        user_id=user_id,
+                        post_id=entry.post_id,
+                        pub_date=entry.pub_date,
+                    )
+                    for user_id in batch
+                    for entry in entries
+                ],
+                ignore_conflicts=True,
+            )
+            trim_timelines(batch)
+
+
+def fan_out(post_ids, followers_limit=None):
+    """Write newly published posts to their followers' timelines."""
+    for entry in FeedEntry.objects.filter(post_id__in=post_ids):
+        sources = (
+            {'author': entry.author_id},
+            {'category': entry.category_id},
+        )
+        for source in sources:
+            if not is_popular(followers_limit, **source):
+                push([entry], Follow.objects.filter(**source))
+
+
+def backfill(follow):
+    """Fill a new follower's timeline with the source's recent posts."""
+    if follow.author_id:
+        entries = FeedEntry.objects.filter(author=follow.author_id)
+    else:
+        entries = FeedEntry.objects.filter(category=follow.category_id)
+    push(
+        list(entries.only('post_id', 'pub_date')[:TIMELINE_LENGTH]),
+        Follow.objects.filter(pk=follow.pk),
+    )
+
+
+def follow(user, **source):
+    follow, created = Follow.objects.get_or_create(user=user, **source)
+    if created:
+        backfill(follow)
+
+
+def unfollow(user, **source):
+    Follow.objects.filter(user=user, **source).delete()
+    follows = Follow.objects.filter(user=user)
+    entries = user.timeline.all()
+    if 'author' in source:
+        # NOT IN over a subquery holding NULLs matches nothing.
+        entries = entries.filter(post__author=source['author']).exclude(
+            post__category__in=follows.exclude(category=None)
+            .values('category')
+        )
+    else:
+        entries = entries.filter(post__category=source['category']).exclude(
+            post__author__in=follows.exclude(author=None).values('author')
+        )
+    entries.delete()
+
+
+def get_timeline(user, followers_limit=None):
+    """Visible posts from the user's timeline plus popular sources."""
+    follows = list(Follow.objects.filter(user=user))
+    popular_authors = [
+        item.author_id for item in follows
+        if item.author_id
+        and is_popular(followers_limit, author=item.author_id)
+    ]
+    popular_categories = [
+        item.category_id for item in follows
+        if item.category_id
+        and is_popular(followers_limit, category=item.category_id)
+    ]
+    return FeedEntry.objects.filter(
+        Q(post__in=user.timeline.values('post'))
+        | Q(author__in=popular_authors)
+        | Q(category__in=popular_categories)
+    )
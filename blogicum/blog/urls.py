@@ -1,6 +1,6 @@
 from django.urls import path
 
-from . import views
+from . import api, sitemaps, views
 
 
 app_name = 'blog'
@@ -11,6 +11,15 @@ urlpatterns = [
     path('profile/<str:username>/',
          views.Profile.as_view(),
          name='profile'),
+    path('profile/<str:username>/follow/',
+         views.AuthorFollowView.as_view(),
+         name='follow_author'),
+    path('profile/<str:username>/unfollow/',
+         views.AuthorFollowView.as_view(follow=False),
+         name='unfollow_author'),
+    path('feed/',
+         views.FollowFeedView.as_view(),
+         name='follow_feed'),
     path('posts/<int:post_id>/',
          views.PostDetailView.as_view(),
          name='post_detail'),
@@ -32,10 +41,43 @@ urlpatterns = [
     path('posts/create/',
          views.PostCreateView.as_view(),
          name='create_post'),
+    path('category/',
+         views.CategoryIndexView.as_view(),
+         name='categories'),
     path('category/<slug:category_slug>/',
          views.CategoryListView.as_view(),
          name='category_posts'),
+    path('category/<slug:category_slug>/follow/',
+         views.CategoryFollowView.as_view(),
+         name='follow_category'),
+    path('category/<slug:category_slug>/unfollow/',
+         views.CategoryFollowView.as_view(follow=False),
+         name='unfollow_category'),
     path('',
          views.PostListView.as_view(),
          name='index'),
+    path('api/posts/',
+         api.feed,
+         name='api_feed'),
+    path('api/posts/<int:post_id>/',
+         api.post_detail,
+         name='api_post_detail'),
+    path('api/posts/<int:post_id>/comments/',
+         api.comment_list,
+         name='api_comments'),
+    path('api/category/<slug:category_slug>/posts/',
+         api.category_feed,
+         name='api_category_feed'),
+    path('api/profile/<str:username>/posts/',
+         api.profile_feed,
+         name='api_profile_feed'),
+    path('api/locations/',
+         api.location_autocomplete,
+         name='location_autocomplete'),
+    path('sitemap.xml',
+         sitemaps.sitemap_index,
+         name='sitemap'),
+    path('sitemap-<slug:section>-<int:page>.xml',
+         sitemaps.sitemap_section,
+         name='sitemap_section'),
 ]
@@ -1,22 +1,50 @@
+import uuid
+
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.cache import cache
 from django.core.paginator import Paginator
-from django.db.models import Count
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Window
+from django.db.models.functions import RowNumber
 from django.shortcuts import get_object_or_404, redirect
 from django.views.generic import (
     ListView,
     DetailView,
     CreateView,
     UpdateView,
-    DeleteView
+    DeleteView,
+    View
 )
 from django.urls import reverse, reverse_lazy
-from django.utils import timezone
 
+from .cache import content_cache_key
 from .forms import CommentForm, PostForm, UserForm
-from .models import Category, Comment, Post, User
+from .models import (
+    Category, Comment, FeedEntry, Follow, ImageInfo, Post, User
+)
+from .ratelimit import RateLimitMixin
+from .timeline import follow, get_timeline, unfollow
 
 
 POSTS_ON_PAGE = 10
+# Columns rendered by includes/post_card.html.
+POST_CARD_FIELDS = (
+    'title',
+    'excerpt',
+    'image',
+    'pub_date',
+    'is_published',
+    'author',
+    'author__username',
+    'category',
+    'category__title',
+    'category__slug',
+    'category__is_published',
+    'location',
+    'location__name',
+    'location__is_published',
+)
+CATEGORIES_CACHE_TIMEOUT = 60 * 60
 
 
 class PostMixin:
@@ -57,6 +85,39 @@ class CommentMixin:
         )
 
 
+class IdempotentCreateMixin:
+    """Redirect repeated submissions of a create form to the first object."""
+
+    def get_idempotency_key(self):
+        try:
+            return uuid.UUID(self.request.POST.get('idempotency_key', ''))
+        except ValueError:
+            return None
+
+    def is_duplicate(self, key):
+        return key is not None and self.model.objects.filter(
+            author=self.request.user, idempotency_key=key
+        ).exists()
+
+    def post(self, request, *args, **kwargs):
+        if self.is_duplicate(self.get_idempotency_key()):
+            return redirect(self.get_success_url())
+        return super().post(request, *args, **kwargs)
+
+    def form_valid(self, form):
+        key = form.instance.idempotency_key = (
+            form.cleaned_data['idempotency_key']
+        )
+        try:
+            with transaction.atomic():
+                return super().form_valid(form)
+        except IntegrityError:
+            # A concurrent submission with the same key won the insert.
+            if not self.is_duplicate(key):
+                raise
+        return redirect(self.get_success_url())
+
+
 def get_posts(
     posts=Post.objects.all(),
     select_related=True,
@@ -69,14 +130,31 @@ def get_posts(
         posts = posts.filter(
             is_published=True,
             category__is_published=True,
-            pub_date__lte=timezone.now()
+            is_live=True
         )
     if count_comment:
-        posts = posts.annotate(
-            comment_count=Count('comments')).order_by('-pub_date')
+        posts = posts.annotate(comment_count=Count(
+            'comments', filter=Q(comments__is_published=True)
+        )).order_by('-pub_date')
     return posts
 
 
+def with_image_info(posts):
+    """Annotate posts with image_width, image_height and image_color."""
+    info = ImageInfo.objects.filter(name=OuterRef('image'))
+    return posts.annotate(**{
+        f'image_{name}': Subquery(info.values(name))
+        for name in ('width', 'height', 'color')
+    })
+
+
+def get_post_cards(posts=Post.objects.all(), filter=True):
+    """Posts for cards with only the columns the card template shows."""
+    return with_image_info(
+        get_posts(posts, filter=filter).only(*POST_CARD_FIELDS)
+    )
+
+
 def paginate_posts(request, queryset, per_page=POSTS_ON_PAGE):
     return Paginator(queryset, per_page).get_page(request.GET.get('page'))
 
@@ -86,7 +164,39 @@ class PostListView(ListView):
     template_name = 'blog/index.html'
     paginate_by = POSTS_ON_PAGE
 
-    queryset = get_posts()
+    queryset = FeedEntry.objects.as_posts()
+
+
+def get_categories():
+    """Published categories with visible posts and their latest post."""
+
+    def load():
+        latest = FeedEntry.objects.annotate(rank=Window(
+            RowNumber(),
+            partition_by=F('category'),
+            order_by=F('pub_date').desc(),
+        )).filter(rank=1).only('post_id', 'category_id', 'title', 'pub_date')
+        latest = {entry.category_id: entry for entry in latest}
+        categories = list(
+            Category.objects.filter(is_published=True, posts_count__gt=0)
+            .order_by('title')
+            .only('title', 'slug', 'description', 'posts_count')
+        )
+        for category in categories:
+            category.latest_post = latest.get(category.pk)
+        return categories
+
+    return cache.get_or_set(
+        content_cache_key('categories'), load, CATEGORIES_CACHE_TIMEOUT
+    )
+
+
+class CategoryIndexView(ListView):
+    template_name = 'blog/categories.html'
+    context_object_name = 'categories'
+
+    def get_queryset(self):
+        return get_categories()
 
 
 class CategoryListView(ListView):
@@ -102,12 +212,17 @@ class CategoryListView(ListView):
         )
 
     def get_queryset(self):
-        return get_posts(self.get_category().posts.all())
+        return self.get_category().feed_entries.as_posts()
 
     def get_context_data(self, **kwargs):
+        category = self.get_category()
         return super().get_context_data(
             **kwargs,
-            category=self.get_category()
+            category=category,
+            is_following=self.request.user.is_authenticated
+            and Follow.objects.filter(
+                user=self.request.user, category=category
+            ).exists()
         )
 
 
@@ -117,26 +232,32 @@ class PostDetailView(DetailView):
     context_object_name = 'post'
     pk_url_kwarg = 'post_id'
 
+    def get_queryset(self):
+        return with_image_info(super().get_queryset())
+
     def get_object(self, queryset=None):
         post = super().get_object(queryset)
         if post.author == self.request.user:
             return post
-        return super().get_object(get_posts(
+        return super().get_object(with_image_info(get_posts(
             select_related=False, count_comment=False
-        ))
+        )))
 
     def get_context_data(self, **kwargs):
         return super().get_context_data(
             **kwargs,
             form=CommentForm(),
-            comments=self.object.comments.all()
+            comments=self.object.comments.filter(is_published=True)
         )
 
 
-class PostCreateView(LoginRequiredMixin, CreateView):
+class PostCreateView(
+    LoginRequiredMixin, IdempotentCreateMixin, RateLimitMixin, CreateView
+):
     model = Post
     form_class = PostForm
     template_name = 'blog/create.html'
+    ratelimit_scope = 'post'
 
     def form_valid(self, form):
         form.instance.author = self.request.user
@@ -164,7 +285,7 @@ class PostDeleteView(LoginRequiredMixin, PostMixin, DeleteView):
 
 
 class Profile(DetailView):
-    model = User
+    queryset = User.objects.select_related('stats')
     template_name = 'blog/profile.html'
     context_object_name = 'profile'
     slug_field = 'username'
@@ -174,21 +295,55 @@ class Profile(DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         author = self.object
-        get_posts(
-            author.posts.all(),
-            filter=self.request.user != author)
-
+        if self.request.user == author:
+            posts = get_post_cards(author.posts.all(), filter=False)
+        else:
+            posts = author.feed_entries.as_posts()
         context['page_obj'] = paginate_posts(
             self.request,
-            get_posts(
-                author.posts.all(),
-                filter=self.request.user != author
-            ),
+            posts,
             self.paginate_by
         )
+        context['is_following'] = (
+            self.request.user.is_authenticated
+            and author.followers.filter(user=self.request.user).exists()
+        )
         return context
 
 
+class FollowFeedView(LoginRequiredMixin, ListView):
+    template_name = 'blog/follow.html'
+    paginate_by = POSTS_ON_PAGE
+
+    def get_queryset(self):
+        return get_timeline(self.request.user).as_posts()
+
+
+class AuthorFollowView(LoginRequiredMixin, View):
+    follow = True
+
+    def post(self, request, username):
+        author = get_object_or_404(User, username=username)
+        if author != request.user:
+            (follow if self.follow else unfollow)(request.user, author=author)
+        return redirect('blog:profile', username=username)
+
+
+class CategoryFollowView(LoginRequiredMixin, View):
+    follow = True
+
+    def post(self, request, category_slug):
+        category = get_object_or_404(
+            Category,
+            slug=category_slug,
+            is_published=True
+        )
+        (follow if self.follow else unfollow)(
+            request.user, category=category
+        )
+        return redirect('blog:category_posts', category_slug=category_slug)
+
+
 class ProfileUpdateView(LoginRequiredMixin, UpdateView):
     model = User
     form_class = UserForm
@@ -204,10 +359,13 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
         )
 
 
-class CommentCreateView(LoginRequiredMixin, CreateView):
+class CommentCreateView(
+    LoginRequiredMixin, IdempotentCreateMixin, RateLimitMixin, CreateView
+):
     model = Comment
     form_class = CommentForm
     template_name = 'blog/comment.html'
+    ratelimit_scope = 'comment'
 
     def form_valid(self, form):
         form.instance.author = self.request.user
@@ -0,0 +1,26 @@
+import re
+
+from django.template.loaders import filesystem
+
+
+re_tags = re.compile(r'(\{%((?!%\}).)*%\})+')
+
+
+class Loader(filesystem.Loader):
+    """Filesystem loader that drops indentation and blank lines.
+
+    The cached loader compiles each template once per process, so the
+    whitespace is stripped once instead of from every response. Line
+    breaks are kept after text, which keeps words on adjacent lines apart,
+    and dropped after lines holding nothing but block tags. Project
+    templates must not rely on indentation inside <pre> or <textarea>.
+    """
+
+    def get_contents(self, origin):
+        parts = []
+        for line in super().get_contents(origin).splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            parts.append(line if re_tags.fullmatch(line) else line + '\n')
+        return ''.join(parts)
@@ -0,0 +1,121 @@
+import mimetypes
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
+from django.utils._os import safe_join
+from django.utils.regex_helper import _lazy_re_compile
+from django.views.decorators.http import require_safe
+
+from .middleware import IMMUTABLE_MAX_AGE
+
+
+MEDIA_MAX_AGE = 60 * 60
+RANGE_CHUNK_SIZE = 64 * 1024
+
+re_range = _lazy_re_compile(r'^bytes=(\d*)-(\d*)$')
+# Content-addressed uploads are named by the hex digest of their bytes.
+re_content_addressed = _lazy_re_compile(r'(^|/)[0-9a-f]{32,}\.\w+$')
+
+
+def get_range(header, size):
+    """(start, end) of a single byte range, None for the whole file.
+
+    Raises ValueError if the range cannot be satisfied.
+    """
+    match = re_range.match(header)
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start > end or start >= size:
+        raise ValueError(header)
+    return start, end
+
+
+def iter_range(file, start, length):
+    with file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(RANGE_CHUNK_SIZE, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+def send_file(request, path, name, etag):
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    mode = settings.MEDIA_SERVE_MODE
+    if mode == 'x-accel-redirect':
+        response = HttpResponse(content_type=content_type)
+        response.headers['X-Accel-Redirect'] = (
+            settings.MEDIA_ACCEL_PREFIX + quote(name)
+        )
+        return response
+    if mode == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response.headers['X-Sendfile'] = str(path)
+        return response
+    size = path.stat().st_size
+    header = request.META.get('HTTP_RANGE', '')
+    if request.META.get('HTTP_IF_RANGE', etag) != etag:
+        header = ''
+    try:
+        byte_range = get_range(header, size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response.headers['Content-Range'] = f'bytes */{size}'
+        return response
+    if byte_range is None:
+        # wsgi.file_wrapper lets the server use sendfile() for the body.
+        response = FileResponse(path.open('rb'), content_type=content_type)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            iter_range(path.open('rb'), start, end - start + 1),
+            status=206,
+            content_type=content_type,
+        )
+        response.headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response.headers['Content-Length'] = str(end - start + 1)
+    response.headers['Accept-Ranges'] = 'bytes'
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    """Serve an uploaded file, or hand it over to the front web server."""
+    try:
+        full_path = Path(safe_join(settings.MEDIA_ROOT, path))
+    except SuspiciousFileOperation:
+        raise Http404
+    if not full_path.is_file():
+        raise Http404
+    stat = full_path.stat()
+    etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+    if request.META.get('HTTP_IF_NONE_MATCH') == etag:
+        response = HttpResponseNotModified()
+    else:
+        response = send_file(request, full_path, path, etag)
+    response.headers['ETag'] = etag
+    response.headers['Cache-Control'] = (
+        f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+        if re_content_addressed.search(path)
+        else f'public, max-age={MEDIA_MAX_AGE}'
+    )
+    return response
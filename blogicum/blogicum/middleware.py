@@ -0,0 +1,156 @@
+import json
+import mimetypes
+from pathlib import Path, PurePosixPath
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse, HttpResponseNotModified
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+BROTLI_QUALITY = 5
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+STATIC_MAX_AGE = 60
+
+re_accepts_brotli = _lazy_re_compile(r'\bbr\b')
+re_accepts_gzip = _lazy_re_compile(r'\bgzip\b')
+re_compressible_type = _lazy_re_compile(
+    r'^(text/|application/(json|javascript|xml|[\w.+-]+\+(json|xml))\b'
+    r'|image/svg\+xml\b)'
+)
+
+
+def is_compressible(response):
+    """Whether compressing the response on the fly is worth it and safe.
+
+    Files keep their sendfile() path and byte ranges their identity
+    Content-Range; images and other binary types are compressed already.
+    """
+    return (
+        response.status_code != 206
+        and not isinstance(response, FileResponse)
+        and re_compressible_type.match(response.get('Content-Type', ''))
+    )
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """GZipMiddleware with a size threshold and optional Brotli.
+
+    Brotli is used when the package is installed and the client accepts
+    it. Streaming responses always go through gzip, and so do responses
+    to requests that generated or sent a CSRF token: only gzip gets the
+    random padding that is Django's BREACH mitigation.
+    """
+
+    def process_response(self, request, response):
+        if not is_compressible(response) or (
+            not response.streaming
+            and len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return response
+        if (
+            brotli is None
+            or response.streaming
+            or 'CSRF_COOKIE' in request.META
+            or response.has_header('Content-Encoding')
+            or not re_accepts_brotli.search(
+                request.META.get('HTTP_ACCEPT_ENCODING', '')
+            )
+        ):
+            return super().process_response(request, response)
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressed = brotli.compress(response.content, quality=BROTLI_QUALITY)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
+
+
+class StaticFilesMiddleware:
+    """Serve collected static files from STATIC_ROOT without a web server.
+
+    Files are indexed once when the worker starts. Hashed names from the
+    staticfiles manifest never change and are cached for a year; the
+    precompressed .br/.gz copies are chosen by Accept-Encoding.
+    """
+
+    def __init__(self, get_response):
+        if settings.DEBUG or not settings.STATIC_ROOT:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = urlsplit(settings.STATIC_URL).path
+        root = Path(settings.STATIC_ROOT)
+        self.files = {
+            path.relative_to(root).as_posix(): path
+            for path in (root.rglob('*') if root.is_dir() else ())
+            if path.is_file()
+        }
+        manifest = root / 'staticfiles.json'
+        self.immutable = set(
+            json.loads(manifest.read_text())['paths'].values()
+            if manifest.is_file() else ()
+        )
+
+    def __call__(self, request):
+        path = request.path_info
+        if request.method in ('GET', 'HEAD') and path.startswith(self.prefix):
+            name = path[len(self.prefix):]
+            if name in self.files:
+                return self.serve(request, name)
+        return self.get_response(request)
+
+    def serve(self, request, name):
+        accepted = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        variants = [
+            (encoding, name + suffix, accepts)
+            for encoding, suffix, accepts in (
+                ('br', '.br', re_accepts_brotli),
+                ('gzip', '.gz', re_accepts_gzip),
+            )
+            if name + suffix in self.files
+        ]
+        encoding, variant = next(
+            (
+                (encoding, variant)
+                for encoding, variant, accepts in variants
+                if accepts.search(accepted)
+            ),
+            (None, name),
+        )
+        stat = self.files[variant].stat()
+        etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+        if request.META.get('HTTP_IF_NONE_MATCH') == etag:
+            response = HttpResponseNotModified()
+        else:
+            response = FileResponse(
+                self.files[variant].open('rb'),
+                content_type=(
+                    mimetypes.guess_type(name)[0]
+                    or 'application/octet-stream'
+                ),
+                filename=PurePosixPath(name).name,
+            )
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+        response.headers['ETag'] = etag
+        response.headers['Cache-Control'] = (
+            f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+            if name in self.immutable
+            else f'public, max-age={STATIC_MAX_AGE}'
+        )
+        if variants:
+            patch_vary_headers(response, ('Accept-Encoding',))
+        return response
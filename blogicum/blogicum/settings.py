@@ -42,6 +42,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.sitemaps',
     'blog.apps.BlogConfig',
     'pages.apps.PagesConfig',
     'django_bootstrap5'
@@ -49,6 +50,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'blogicum.middleware.StaticFilesMiddleware',
+    'blogicum.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -66,7 +69,6 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -74,6 +76,15 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # Compiled templates are kept for the life of the process; the
+            # development server resets them when a template changes.
+            # Project templates are loaded with indentation stripped.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'blogicum.loaders.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
@@ -132,10 +143,35 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
 
+STATIC_ROOT = BASE_DIR / 'static_root'
+
+# In production `collectstatic` writes content-hashed names plus .gz/.br
+# copies, which StaticFilesMiddleware serves with immutable caching.
+STORAGES = {
+    'default': {
+        'BACKEND': 'blogicum.storage.ContentAddressedStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage'
+            if DEBUG else
+            'blogicum.storage.CompressedManifestStaticFilesStorage'
+        ),
+    },
+}
+
 MEDIA_URL = 'media/'
 
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# How uploaded files leave the server: 'django' streams them from Python
+# (sendfile() where the WSGI server supports it), 'x-sendfile' and
+# 'x-accel-redirect' hand the file over to Apache or nginx; nginx needs an
+# internal location at MEDIA_ACCEL_PREFIX aliased to MEDIA_ROOT.
+MEDIA_SERVE_MODE = 'django'
+
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
@@ -148,6 +184,62 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # CSRF
 CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
 
+# Sitemaps
+SITEMAP_ROOT = BASE_DIR / 'sitemaps'
+
+SITEMAP_DOMAIN = 'gohub.pythonanywhere.com'
+
+SITEMAP_PAGE_SIZE = 10000
+
+SITEMAP_CACHE_TIMEOUT = 60 * 60
+
+# Responses shorter than this are sent uncompressed.
+COMPRESSION_MIN_SIZE = 1024
+
+# Cache; the rate limit buckets must be shared by all worker processes,
+# so they live in the database (run `manage.py createcachetable`).
+# Sessions and the version of cached content pages must be shared too, or
+# a logout or publication would not reach the other workers; the file
+# cache is shared by the workers of one host, several hosts need Redis or
+# Memcached here instead.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'ratelimit': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'blog_ratelimit',
+    },
+    'sessions': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'sessions',
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+    'content': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'content',
+    },
+}
+
+CONTENT_VERSION_CACHE = 'content'
+
+# Sessions are read from the shared cache and written through to the
+# database. Messages are kept in a cookie so that they never create a
+# session for anonymous visitors.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'sessions'
+
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
+# Rate limits: token bucket capacity and seconds to refill one token
+# per user and per client IP address; None disables a limit.
+RATELIMIT_CACHE = 'ratelimit'
+
+RATELIMITS = {
+    'comment': {'user': (5, 12), 'ip': (20, 3)},
+    'post': {'user': (5, 60), 'ip': (10, 20)},
+}
+
 # Redirect URL
 LOGIN_REDIRECT_URL = 'blog:index'
 LOGOUT_REDIRECT_URL = 'blog:index'
@@ -0,0 +1,80 @@
+import gzip
+import hashlib
+import os
+import posixpath
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.storage import FileSystemStorage
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.json', '.map', '.svg', '.txt', '.xml', '.ico',
+)
+
+
+def compressors():
+    yield '.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield '.br', brotli.compress
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest storage that also writes .gz and .br copies of text files.
+
+    The copies are kept only when they are smaller than the original; they
+    are picked by blogicum.middleware.StaticFilesMiddleware.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        names = {*self.hashed_files, *self.hashed_files.values()}
+        for name in sorted(names):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self.compress(name)
+
+    def compress(self, name):
+        with self.open(name) as original:
+            data = original.read()
+        for suffix, compress in compressors():
+            compressed = compress(data)
+            if len(compressed) < len(data):
+                with open(self.path(name + suffix), 'wb') as target:
+                    target.write(compressed)
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """File storage that names uploads by the SHA-256 of their bytes.
+
+    An upload identical to a stored file reuses its name instead of being
+    written again, so several posts may share one file. Deleting a post
+    never removes its image: blog.images drops files only once no post
+    refers to them.
+    """
+
+    def __init__(self, **kwargs):
+        # Concurrent uploads of the same bytes write the same file.
+        kwargs.setdefault('allow_overwrite', True)
+        super().__init__(**kwargs)
+
+    def hashed_name(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        directory, filename = posixpath.split(name)
+        extension = posixpath.splitext(filename)[1].lower()
+        return posixpath.join(directory, digest.hexdigest() + extension)
+
+    def _save(self, name, content):
+        name = self.hashed_name(name, content)
+        if self.exists(name):
+            # Restart the grace period of the media garbage collector.
+            os.utime(self.path(name))
+            return name
+        return super()._save(name, content)
@@ -1,9 +1,9 @@
 from django.contrib.auth.forms import UserCreationForm
-from django.conf.urls.static import static
 from django.conf import settings
 from django.contrib import admin
 from django.views.generic.edit import CreateView
 from django.urls import path, include, reverse_lazy
+from .media import serve_media
 from .views import CustomLogoutView
 
 
@@ -34,11 +34,16 @@ urlpatterns = [
         'pages/',
         include('pages.urls')
     ),
+    path(
+        f'{settings.MEDIA_URL.strip("/")}/<path:path>',
+        serve_media,
+        name='media'
+    ),
     path(
         '',
         include('blog.urls')
     ),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+]
 
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.server_errors'
@@ -0,0 +1,19 @@
+from pathlib import Path
+
+from django.template import engines
+
+
+def warm_templates():
+    """Compile every project template into the cached loaders.
+
+    Called once per worker process so that the first requests after a
+    deploy do not pay for parsing templates. Returns the number of
+    templates compiled.
+    """
+    count = 0
+    for engine in engines.all():
+        for directory in map(Path, engine.engine.dirs):
+            for path in sorted(directory.rglob('*.html')):
+                engine.get_template(path.relative_to(directory).as_posix())
+                count += 1
+    return count
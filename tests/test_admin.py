@@ -0,0 +1,76 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def count_changelist_queries(admin_client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(url)
+    assert response.status_code == 200
+    return len(queries)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url, model",
+    [("/admin/blog/post/", "blog.Post"),
+     ("/admin/blog/comment/", "blog.Comment")],
+)
+def test_changelist_queries_do_not_grow_with_rows(
+        admin_client, mixer, url, model
+):
+    mixer.cycle(3).blend(model)
+    few_rows = count_changelist_queries(admin_client, url)
+    mixer.cycle(20).blend(model)
+    many_rows = count_changelist_queries(admin_client, url)
+    assert few_rows == many_rows, (
+        f"Убедитесь, что число запросов к БД на странице `{url}` не зависит"
+        " от количества отображаемых объектов."
+    )
+
+
+@pytest.mark.django_db
+def test_post_changelist_search(admin_client, mixer):
+    post = mixer.blend("blog.Post", title="Уникальный заголовок")
+    response = admin_client.get("/admin/blog/post/?q=Уникальный")
+    assert post.title in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_bulk_unpublish_uses_single_update(admin_client, mixer):
+    posts = mixer.cycle(5).blend("blog.Post", is_published=True)
+    with CaptureQueriesContext(connection) as queries:
+        admin_client.post("/admin/blog/post/", {
+            "action": "unpublish",
+            "_selected_action": [post.id for post in posts],
+        })
+    updates = [
+        query for query in queries
+        if query["sql"].startswith('UPDATE "blog_post"')
+    ]
+    assert len(updates) == 1, (
+        "Убедитесь, что массовое снятие с публикации выполняется одним"
+        " запросом UPDATE."
+    )
+    assert not any(
+        post.is_published
+        for post in type(posts[0]).objects.filter(id__in=[p.id for p in posts])
+    )
+
+
+@pytest.mark.django_db
+def test_unpublish_authors_content(admin_client, mixer, user, another_user):
+    spam = mixer.cycle(3).blend("blog.Post", author=user)
+    spam_comments = mixer.cycle(2).blend("blog.Comment", author=user)
+    other = mixer.blend("blog.Post", author=another_user)
+    admin_client.post("/admin/blog/post/", {
+        "action": "unpublish_authors_content",
+        "_selected_action": [spam[0].id],
+    })
+    Post = type(other)
+    Comment = type(spam_comments[0])
+    assert not Post.objects.filter(author=user, is_published=True).exists()
+    assert not Comment.objects.filter(
+        author=user, is_published=True
+    ).exists()
+    assert Post.objects.get(id=other.id).is_published
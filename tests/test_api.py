@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+
+@pytest.fixture
+def api_posts(mixer, user, published_category, published_location):
+    return mixer.cycle(5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+        is_published=True,
+        pub_date=(
+            timezone.now() - timedelta(days=day) for day in range(1, 6)
+        ),
+    )
+
+
+@pytest.mark.django_db
+def test_api_feed_cursor_pagination(client, api_posts):
+    seen = []
+    url = "/api/posts/?limit=2&fields=id,title,comment_count"
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        data = response.json()
+        assert all(
+            set(item) == {"id", "title", "comment_count"}
+            for item in data["results"]
+        ), "Убедитесь, что API возвращает только запрошенные поля."
+        seen.extend(item["id"] for item in data["results"])
+        url = data["next"]
+    assert seen == [post.id for post in api_posts], (
+        "Убедитесь, что курсорная пагинация API обходит все опубликованные"
+        " посты в порядке убывания даты публикации."
+    )
+
+
+@pytest.mark.django_db
+def test_api_hides_unpublished(client, user_client, user, mixer, api_posts):
+    hidden = mixer.blend(
+        "blog.Post", author=user, is_published=False,
+        category=api_posts[0].category,
+    )
+    assert client.get(f"/api/posts/{hidden.id}/").status_code == 404
+    assert user_client.get(f"/api/posts/{hidden.id}/").status_code == 200
+    ids = [
+        item["id"]
+        for item in client.get(
+            f"/api/profile/{user.username}/posts/"
+        ).json()["results"]
+    ]
+    assert hidden.id not in ids
+
+
+@pytest.mark.django_db
+def test_api_detail_and_comments(client, mixer, api_posts):
+    post = api_posts[0]
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    data = client.get(f"/api/posts/{post.id}/").json()
+    assert data["comment_count"] == 3
+    assert data["location"] == post.location.name
+    comments = client.get(f"/api/posts/{post.id}/comments/").json()
+    assert len(comments["results"]) == 3
+    assert client.get("/api/posts/?fields=password").status_code == 400
+    assert client.get("/api/posts/?cursor=broken").status_code == 400
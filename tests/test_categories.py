@@ -0,0 +1,126 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils import timezone
+
+from blog.cache import get_content_version
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_categories_index(
+        client, mixer, user, published_category, django_assert_num_queries,
+        django_capture_on_commit_callbacks):
+    now = timezone.now()
+    older, latest = (
+        mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            is_published=True, pub_date=now - timedelta(days=days),
+        )
+        for days in (2, 1)
+    )
+    empty = mixer.blend("blog.Category", is_published=True)
+    hidden = mixer.blend("blog.Category", is_published=False)
+    mixer.blend("blog.Post", author=user, category=hidden, is_published=True)
+
+    response = client.get("/category/")
+    content = response.content.decode()
+    assert published_category.title in content
+    assert latest.title in content
+    assert older.title not in content, (
+        "Убедитесь, что для категории выводится только последний пост."
+    )
+    assert response.context["categories"][0].posts_count == 2
+    assert empty.title not in content
+    assert hidden.title not in content
+
+    with django_assert_num_queries(0):
+        client.get("/category/")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        newest = mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            is_published=True, pub_date=now,
+        )
+    content = client.get("/category/").content.decode()
+    assert newest.title in content, (
+        "Убедитесь, что кеш страницы категорий сбрасывается при публикации."
+    )
+
+
+@pytest.mark.django_db
+def test_categories_cache_ignores_comments(
+        client, mixer, user, published_category, django_assert_num_queries,
+        django_capture_on_commit_callbacks):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+    )
+    client.get("/category/")
+    with django_capture_on_commit_callbacks(execute=True):
+        mixer.blend("blog.Comment", author=user, post=post)
+    with django_assert_num_queries(0):
+        client.get("/category/")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        post.is_published = False
+        post.save()
+    content = client.get("/category/").content.decode()
+    assert published_category.title not in content, (
+        "Убедитесь, что кеш страницы категорий сбрасывается при снятии"
+        " поста с публикации."
+    )
+
+
+def test_content_version_is_shared_between_workers(settings):
+    assert not isinstance(
+        caches[settings.CONTENT_VERSION_CACHE], LocMemCache
+    ), (
+        "Убедитесь, что версия кешированных страниц хранится в кеше, общем"
+        " для всех процессов."
+    )
+
+
+@pytest.mark.django_db
+def test_categories_cache_follows_latest_post_edits(
+        client, mixer, user, published_category,
+        django_capture_on_commit_callbacks):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+    )
+    client.get("/category/")
+    with django_capture_on_commit_callbacks(execute=True):
+        post.title = "Новый заголовок"
+        post.save()
+    content = client.get("/category/").content.decode()
+    assert "Новый заголовок" in content, (
+        "Убедитесь, что кеш страницы категорий сбрасывается при изменении"
+        " заголовка последнего поста."
+    )
+
+
+@pytest.mark.django_db
+def test_content_is_invalidated_after_commit(
+        mixer, user, published_category, django_capture_on_commit_callbacks):
+    version = get_content_version()
+    with django_capture_on_commit_callbacks() as callbacks:
+        mixer.cycle(3).blend(
+            "blog.Post", author=user, category=published_category,
+            is_published=True,
+        )
+        assert get_content_version() == version, (
+            "Убедитесь, что версия кеша меняется только после фиксации"
+            " транзакции."
+        )
+    for callback in callbacks:
+        callback()
+    assert get_content_version() != version
@@ -0,0 +1,71 @@
+import gzip
+import zlib
+from types import SimpleNamespace
+
+import pytest
+
+from blogicum import middleware
+
+
+@pytest.fixture
+def many_posts(mixer, user, published_category):
+    return mixer.cycle(10).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+    )
+
+
+@pytest.mark.django_db
+def test_feed_is_gzipped(client, many_posts):
+    plain = client.get("/")
+    response = client.get("/", HTTP_ACCEPT_ENCODING="gzip")
+    assert response["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response["Vary"]
+    assert gzip.decompress(response.content) == plain.content
+
+
+@pytest.mark.django_db
+def test_small_responses_are_not_compressed(settings, client, many_posts):
+    settings.COMPRESSION_MIN_SIZE = 10 ** 6
+    response = client.get("/", HTTP_ACCEPT_ENCODING="gzip")
+    assert not response.has_header("Content-Encoding")
+
+
+@pytest.mark.django_db
+def test_templates_are_stripped(client):
+    content = client.get("/").content.decode()
+    assert "\n " not in content, (
+        "Убедитесь, что отступы шаблонов удаляются при их компиляции."
+    )
+    assert "\n\n" not in content
+
+
+def test_line_breaks_are_kept_after_inline_tags(tmp_path):
+    from django.template import Context, Engine
+
+    (tmp_path / "page.html").write_text(
+        "{% if True %}Планета{% endif %}\nЗемля\n"
+        "  {% if True %}{% endif %}\n  !\n"
+    )
+    engine = Engine(
+        dirs=[tmp_path], loaders=["blogicum.loaders.Loader"]
+    )
+    page = engine.get_template("page.html").render(Context())
+    assert page == "Планета\nЗемля\n!\n"
+
+
+@pytest.mark.django_db
+def test_pages_with_csrf_token_skip_brotli(
+        settings, monkeypatch, client, many_posts):
+    settings.COMPRESSION_MIN_SIZE = 0
+    monkeypatch.setattr(
+        middleware, "brotli",
+        SimpleNamespace(compress=lambda data, quality: zlib.compress(data)),
+    )
+    response = client.get("/", HTTP_ACCEPT_ENCODING="gzip, br")
+    assert response["Content-Encoding"] == "br"
+    response = client.get("/auth/login/", HTTP_ACCEPT_ENCODING="gzip, br")
+    assert response["Content-Encoding"] == "gzip", (
+        "Убедитесь, что страницы с CSRF-токеном сжимаются gzip со случайным"
+        " дополнением, а не Brotli."
+    )
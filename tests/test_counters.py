@@ -0,0 +1,83 @@
+import pytest
+
+from blog.feed import recount_counters
+from blog.models import Category, Location
+
+
+@pytest.fixture
+def counted_posts(mixer, user, published_category, published_location):
+    return mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category,
+        location=published_location, is_published=True,
+    )
+
+
+def assert_counts(category, location, count, posts):
+    category.refresh_from_db()
+    location.refresh_from_db()
+    latest = max((post.pub_date for post in posts), default=None)
+    for place in (category, location):
+        assert place.posts_count == count, (
+            "Убедитесь, что счётчик видимых постов обновляется при записи."
+        )
+        assert place.last_published_at == latest
+
+
+@pytest.mark.django_db
+def test_counters_follow_publication(
+        counted_posts, published_category, published_location):
+    assert_counts(published_category, published_location, 3, counted_posts)
+
+    post = counted_posts[0]
+    post.is_published = False
+    post.save()
+    assert_counts(
+        published_category, published_location, 2, counted_posts[1:]
+    )
+
+    post.is_published = True
+    post.save()
+    assert_counts(published_category, published_location, 3, counted_posts)
+
+    counted_posts[1].delete()
+    assert_counts(
+        published_category, published_location, 2,
+        [counted_posts[0], counted_posts[2]]
+    )
+
+
+@pytest.mark.django_db
+def test_counters_follow_moves(mixer, counted_posts, published_category,
+                               published_location):
+    other_category = mixer.blend("blog.Category", is_published=True)
+    other_location = mixer.blend("blog.Location", is_published=True)
+    post = counted_posts[0]
+    post.category = other_category
+    post.location = other_location
+    post.save()
+    assert_counts(
+        published_category, published_location, 2, counted_posts[1:]
+    )
+    assert_counts(other_category, other_location, 1, [post])
+
+
+@pytest.mark.django_db
+def test_recount_counters(counted_posts, published_category,
+                          published_location):
+    Category.objects.update(posts_count=0, last_published_at=None)
+    Location.objects.update(posts_count=100)
+    recount_counters()
+    assert_counts(published_category, published_location, 3, counted_posts)
+
+
+@pytest.mark.django_db
+def test_deleting_category_updates_counters(
+        counted_posts, user, published_category, published_location):
+    published_category.delete()
+    published_location.refresh_from_db()
+    assert published_location.posts_count == 0, (
+        "Убедитесь, что при удалении категории обновляются счётчики"
+        " местоположений."
+    )
+    assert published_location.last_published_at is None
+    assert user.stats.posts_count == 0
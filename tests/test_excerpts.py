@@ -0,0 +1,53 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import FeedEntry, Post
+
+
+LONG_TEXT = " ".join(f"слово{index}" for index in range(50))
+
+
+@pytest.mark.django_db
+def test_excerpt_is_computed_on_save(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, text=LONG_TEXT,
+    )
+    assert post.excerpt == " ".join(LONG_TEXT.split()[:10]) + " …"
+    assert FeedEntry.objects.get(post=post).excerpt == post.excerpt
+
+    post.text = "Короткий текст"
+    post.save(update_fields=["text"])
+    post.refresh_from_db()
+    assert post.excerpt == "Короткий текст"
+
+
+@pytest.mark.django_db
+def test_feed_cards_skip_full_text(client, mixer, user, published_category,
+                                   django_assert_num_queries):
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, text=LONG_TEXT,
+    )
+    with django_assert_num_queries(2):
+        content = client.get("/").content.decode()
+    assert "слово9 …" in content
+    assert "слово10" not in content, (
+        "Убедитесь, что в карточке поста выводится только начало текста."
+    )
+
+
+@pytest.mark.django_db
+def test_backfill_excerpts(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, text=LONG_TEXT,
+    )
+    Post.objects.update(excerpt="")
+    FeedEntry.objects.update(excerpt="")
+    call_command("backfill_excerpts", chunk_size=1, stdout=StringIO())
+    post.refresh_from_db()
+    assert post.excerpt.startswith("слово0")
+    assert FeedEntry.objects.get(post=post).excerpt == post.excerpt
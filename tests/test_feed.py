@@ -0,0 +1,56 @@
+import pytest
+
+from blog.models import FeedEntry
+
+
+@pytest.fixture
+def feed_posts(mixer, user, published_category, published_location):
+    return mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category,
+        location=published_location, is_published=True,
+    )
+
+
+@pytest.mark.django_db
+def test_index_reads_feed_table(client, feed_posts, django_assert_num_queries):
+    with django_assert_num_queries(2):
+        response = client.get("/")
+    for post in feed_posts:
+        assert post.title in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_feed_follows_post_and_category_changes(mixer, feed_posts):
+    post = feed_posts[0]
+    assert FeedEntry.objects.count() == 3
+
+    post.is_published = False
+    post.save()
+    assert not FeedEntry.objects.filter(post=post).exists()
+
+    category = post.category
+    category.is_published = False
+    category.save()
+    assert not FeedEntry.objects.exists(), (
+        "Убедитесь, что посты скрытой категории удаляются из ленты."
+    )
+    category.is_published = True
+    category.save()
+    assert FeedEntry.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_feed_follows_related_changes(mixer, feed_posts):
+    post = feed_posts[0]
+    mixer.cycle(2).blend("blog.Comment", post=post)
+    assert FeedEntry.objects.get(post=post).comment_count == 2
+
+    location = post.location
+    location.is_published = False
+    location.save()
+    assert FeedEntry.objects.get(post=post).location_name is None
+
+    author = post.author
+    author.username = "renamed"
+    author.save()
+    assert FeedEntry.objects.get(post=post).author_username == "renamed"
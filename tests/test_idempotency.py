@@ -0,0 +1,59 @@
+import uuid
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from blog.views import IdempotentCreateMixin
+
+
+@pytest.fixture
+def idempotent_post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+    )
+
+
+@pytest.mark.django_db
+def test_comment_form_renders_key(user_client, idempotent_post):
+    response = user_client.get(f"/posts/{idempotent_post.pk}/")
+    form = response.context["form"]
+    assert uuid.UUID(str(form["idempotency_key"].value()))
+    assert 'name="idempotency_key"' in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_repeated_comment_is_not_duplicated(user_client, idempotent_post):
+    url = f"/posts/{idempotent_post.pk}/comment/"
+    data = {"text": "Текст", "idempotency_key": str(uuid.uuid4())}
+    for _ in range(2):
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.FOUND
+    assert idempotent_post.comments.count() == 1, (
+        "Убедитесь, что повторная отправка формы комментария не создаёт "
+        "дубликат."
+    )
+
+
+@pytest.mark.django_db
+def test_concurrent_post_submission_hits_constraint(
+        user_client, user, published_category, published_location,
+        monkeypatch):
+    # Skip the early lookup to emulate two requests racing to the insert.
+    monkeypatch.setattr(
+        IdempotentCreateMixin, "get_idempotency_key", lambda self: None
+    )
+    data = {
+        "title": "Заголовок",
+        "text": "Текст",
+        "pub_date": timezone.now().strftime("%Y-%m-%dT%H:%M"),
+        "category": published_category.pk,
+        "location": published_location.pk,
+        "idempotency_key": str(uuid.uuid4()),
+    }
+    for _ in range(2):
+        response = user_client.post("/posts/create/", data=data)
+        assert response.status_code == HTTPStatus.FOUND
+        assert response["Location"] == f"/profile/{user.username}/"
+    assert user.posts.count() == 1
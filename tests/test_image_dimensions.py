@@ -0,0 +1,102 @@
+from io import BytesIO, StringIO
+
+import pytest
+from bs4 import BeautifulSoup
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.models import FeedEntry, ImageInfo, Post
+
+
+def make_image(color=(73, 109, 137), size=(40, 30)):
+    image_io = BytesIO()
+    Image.new("RGB", size, color=color).save(image_io, format="PNG")
+    return ImageFile(image_io, name="photo.png")
+
+
+@pytest.fixture
+def posts_with_images(
+    settings, tmp_path, mixer, user, published_location, published_category
+):
+    settings.MEDIA_ROOT = tmp_path
+    return [
+        mixer.blend(
+            "blog.Post",
+            author=user,
+            location=published_location,
+            category=published_category,
+            is_published=True,
+            image=make_image(color=(index, 0, 0)),
+        )
+        for index in range(2)
+    ]
+
+
+@pytest.mark.django_db
+def test_image_dimensions_are_stored(posts_with_images):
+    post = Post.objects.get(pk=posts_with_images[0].pk)
+    info = ImageInfo.objects.get(name=post.image.name)
+    assert (info.width, info.height) == (40, 30), (
+        "Убедитесь, что размеры изображения сохраняются при загрузке."
+    )
+    assert info.color == "#000000"
+    entry = FeedEntry.objects.get(post=post)
+    assert (entry.image_width, entry.image_height) == (40, 30)
+
+
+@pytest.mark.django_db
+def test_shared_image_is_read_once(posts_with_images, mixer, user):
+    post = posts_with_images[0]
+    copy = mixer.blend(
+        "blog.Post", author=user, image=make_image(color=(0, 0, 0))
+    )
+    assert copy.image.name == post.image.name
+    assert ImageInfo.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_cards_have_dimensions_and_lazy_loading(client, posts_with_images):
+    content = client.get("/").content.decode()
+    images = BeautifulSoup(content, "html.parser").select("article img")
+    assert len(images) == 2
+    for image in images:
+        assert (image["width"], image["height"]) == ("40", "30")
+        assert image["style"].startswith("background-color: #")
+    assert "loading" not in images[0].attrs
+    assert images[1]["loading"] == "lazy", (
+        "Убедитесь, что изображения ниже первой карточки загружаются лениво."
+    )
+
+
+@pytest.mark.django_db
+def test_posts_without_dimensions_do_not_open_files(
+    client, posts_with_images
+):
+    post = posts_with_images[0]
+    Post.objects.filter(pk=post.pk).update(image="posts_images/missing.png")
+    response = client.get(f"/posts/{post.pk}/")
+    assert response.status_code == 200
+    image = BeautifulSoup(response.content, "html.parser").find(
+        "img", src="/media/posts_images/missing.png"
+    )
+    assert "width" not in image.attrs
+
+
+@pytest.mark.django_db
+def test_backfill_images(posts_with_images):
+    ImageInfo.objects.all().delete()
+    FeedEntry.objects.update(
+        image_width=None, image_height=None, image_color=""
+    )
+    output = StringIO()
+    call_command("backfill_images", stdout=output)
+    assert "Обновлено изображений: 2" in output.getvalue()
+    assert set(
+        ImageInfo.objects.values_list("width", "height", "color")
+    ) == {(40, 30, "#000000"), (40, 30, "#010000")}
+    assert set(
+        FeedEntry.objects.values_list(
+            "image_width", "image_height", "image_color"
+        )
+    ) == {(40, 30, "#000000"), (40, 30, "#010000")}
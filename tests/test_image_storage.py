@@ -0,0 +1,112 @@
+import hashlib
+import os
+import time
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.images import release_images
+
+
+def make_image(color=(73, 109, 137), name="photo.JPG"):
+    image_io = BytesIO()
+    Image.new("RGB", (20, 20), color=color).save(image_io, format="JPEG")
+    return ImageFile(image_io, name=name)
+
+
+@pytest.fixture
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def make_post(mixer, user, published_location, published_category):
+    def make_post(image):
+        return mixer.blend(
+            "blog.Post",
+            author=user,
+            location=published_location,
+            category=published_category,
+            image=image,
+        )
+    return make_post
+
+
+def age(path, seconds=2 * 24 * 60 * 60):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+@pytest.mark.django_db
+def test_images_are_named_by_content_and_deduplicated(media, make_post):
+    image = make_image()
+    digest = hashlib.sha256(image.file.getvalue()).hexdigest()
+    first = make_post(image)
+    second = make_post(make_image(name="copy.jpg"))
+    assert first.image.name == f"posts_images/{digest}.jpg", (
+        "Убедитесь, что загруженные изображения называются по хешу "
+        "содержимого."
+    )
+    assert second.image.name == first.image.name
+    assert os.listdir(media / "posts_images") == [f"{digest}.jpg"]
+
+    other = make_post(make_image(color=(0, 0, 0)))
+    assert other.image.name != first.image.name
+
+
+@pytest.mark.django_db
+def test_shared_image_is_released_with_last_post(media, make_post):
+    first = make_post(make_image())
+    second = make_post(make_image())
+    name = first.image.name
+
+    first.delete()
+    assert release_images([name]) == set()
+    assert (media / name).exists(), (
+        "Убедитесь, что удаление поста не удаляет файл, который используют "
+        "другие посты."
+    )
+
+    second.delete()
+    assert release_images([name]) == {name}
+    assert not (media / name).exists()
+
+
+@pytest.mark.django_db
+def test_collect_media_removes_old_orphans(media, make_post):
+    used = media / make_post(make_image()).image.name
+    orphan = media / "posts_images" / "old" / "orphan.jpg"
+    fresh = media / "posts_images" / "fresh.jpg"
+    orphan.parent.mkdir()
+    orphan.write_bytes(b"orphan")
+    fresh.write_bytes(b"fresh")
+    age(used)
+    age(orphan)
+
+    output = StringIO()
+    call_command("collect_media", "--dry-run", stdout=output)
+    assert "posts_images/old/orphan.jpg" in output.getvalue()
+    assert orphan.exists()
+
+    call_command("collect_media", "--batch-size", "1", stdout=StringIO())
+    assert used.exists()
+    assert fresh.exists(), (
+        "Убедитесь, что сборщик не удаляет только что загруженные файлы."
+    )
+    assert not orphan.exists()
+
+
+@pytest.mark.django_db
+def test_reupload_refreshes_orphan_grace_period(media, make_post):
+    post = make_post(make_image())
+    path = media / post.image.name
+    post.delete()
+    age(path)
+
+    make_post(make_image())
+    call_command("collect_media", "--min-age", "60", stdout=StringIO())
+    assert path.exists()
@@ -0,0 +1,49 @@
+import pytest
+from django.urls import reverse
+
+from blog.links import fast_reverse
+
+
+@pytest.mark.parametrize("name, args", [
+    ("blog:post_detail", [7]),
+    ("blog:profile", ["имя пользователя@x+y"]),
+    ("blog:category_posts", ["travel-1"]),
+    ("blog:edit_comment", [3, 11]),
+])
+def test_fast_reverse_matches_reverse(name, args):
+    assert fast_reverse(name, *args) == reverse(name, args=args)
+
+
+@pytest.mark.django_db
+def test_model_urls(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+    )
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    assert post.get_absolute_url() == f"/posts/{post.pk}/"
+    assert post.feed_entry.get_absolute_url() == post.get_absolute_url()
+    assert post.get_author_url() == f"/profile/{user.username}/"
+    assert published_category.get_absolute_url() == (
+        f"/category/{published_category.slug}/"
+    )
+    assert comment.get_author_url() == f"/profile/{user.username}/"
+    assert comment.get_edit_url() == reverse(
+        "blog:edit_comment", args=[post.pk, comment.pk]
+    )
+    assert comment.get_delete_url() == reverse(
+        "blog:delete_comment", args=[post.pk, comment.pk]
+    )
+
+
+@pytest.mark.django_db
+def test_comment_links_on_post_page(mixer, user, user_client,
+                                    published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+    )
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    content = user_client.get(post.get_absolute_url()).content.decode()
+    assert f'href="{comment.get_edit_url()}"' in content
+    assert f'href="{comment.get_delete_url()}"' in content
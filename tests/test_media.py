@@ -0,0 +1,90 @@
+import pytest
+
+CONTENT = bytes(range(256)) * 4
+HASHED_NAME = "posts_images/" + "ab" * 32 + ".jpg"
+
+
+@pytest.fixture
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    for name in ("posts_images/photo.jpg", HASHED_NAME):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(CONTENT)
+    return tmp_path
+
+
+def test_media_file_is_served(client, media):
+    response = client.get("/media/posts_images/photo.jpg")
+    assert response.status_code == 200
+    assert b"".join(response.streaming_content) == CONTENT
+    assert response["Content-Type"] == "image/jpeg"
+    assert response["Accept-Ranges"] == "bytes"
+    assert "immutable" not in response["Cache-Control"]
+
+    response = client.get(
+        "/media/posts_images/photo.jpg",
+        HTTP_IF_NONE_MATCH=response["ETag"],
+    )
+    assert response.status_code == 304
+
+
+def test_content_addressed_media_is_immutable(client, media):
+    response = client.get(f"/media/{HASHED_NAME}")
+    assert "immutable" in response["Cache-Control"], (
+        "Убедитесь, что файлы с именем по хешу содержимого кешируются "
+        "навсегда."
+    )
+
+
+@pytest.mark.parametrize("header, status, body", [
+    ("bytes=10-19", 206, CONTENT[10:20]),
+    ("bytes=-5", 206, CONTENT[-5:]),
+    ("bytes=1000-", 206, CONTENT[1000:]),
+    ("bytes=5000-", 416, b""),
+])
+def test_media_range_requests(client, media, header, status, body):
+    response = client.get(
+        "/media/posts_images/photo.jpg", HTTP_RANGE=header
+    )
+    assert response.status_code == status
+    content = (
+        b"".join(response.streaming_content)
+        if response.streaming else response.content
+    )
+    assert content == body
+
+
+def test_media_accel_redirect(settings, client, media):
+    settings.MEDIA_SERVE_MODE = "x-accel-redirect"
+    response = client.get("/media/posts_images/photo.jpg")
+    assert response["X-Accel-Redirect"] == (
+        "/protected-media/posts_images/photo.jpg"
+    )
+    assert response.content == b""
+
+
+@pytest.mark.django_db
+def test_media_outside_root_is_not_found(client, media):
+    assert client.get("/media/../settings.py").status_code == 404
+    assert client.get("/media/missing.jpg").status_code == 404
+
+
+@pytest.mark.parametrize("headers, status", [
+    ({}, 200),
+    ({"HTTP_RANGE": "bytes=0-99"}, 206),
+])
+def test_media_is_not_compressed(client, media, headers, status):
+    response = client.get(
+        "/media/posts_images/photo.jpg",
+        HTTP_ACCEPT_ENCODING="gzip, br",
+        **headers,
+    )
+    assert response.status_code == status
+    assert not response.has_header("Content-Encoding"), (
+        "Убедитесь, что загруженные файлы и диапазоны байт отдаются"
+        " без сжатия на лету."
+    )
+    assert not response["ETag"].startswith("W/")
+    body = b"".join(response.streaming_content)
+    assert body == (CONTENT if status == 200 else CONTENT[:100])
@@ -0,0 +1,113 @@
+import os
+import time
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from PIL import Image
+
+
+def make_image(color=(73, 109, 137)):
+    image_io = BytesIO()
+    Image.new("RGB", (20, 20), color=color).save(image_io, format="JPEG")
+    return ImageFile(image_io, name="photo.jpg")
+
+
+def age(path, seconds=2 * 24 * 60 * 60):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+@pytest.fixture
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def make_post(mixer, published_location, published_category):
+    def make_post(author, image):
+        post = mixer.blend(
+            "blog.Post",
+            author=author,
+            location=published_location,
+            category=published_category,
+            image=image,
+        )
+        age(post.image.path)
+        return post
+    return make_post
+
+
+@pytest.mark.django_db
+def test_replaced_image_is_removed_after_commit(
+    media, make_post, user, django_capture_on_commit_callbacks
+):
+    post = make_post(user, make_image())
+    old = post.image.path
+    post.image = make_image(color=(0, 0, 0))
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        post.save()
+    assert os.path.exists(old), (
+        "Убедитесь, что старое изображение удаляется только после "
+        "фиксации транзакции."
+    )
+    for callback in callbacks:
+        callback()
+    assert not os.path.exists(old)
+    assert os.path.exists(post.image.path)
+
+
+@pytest.mark.django_db
+def test_cascade_releases_images_in_one_batch(
+    media, make_post, user, another_user, django_capture_on_commit_callbacks,
+    django_assert_max_num_queries
+):
+    shared = make_post(another_user, make_image())
+    posts = [
+        make_post(user, make_image(color=(index, 0, 0)))
+        for index in range(5)
+    ]
+    make_post(user, make_image())
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        user.delete()
+    with django_assert_max_num_queries(2):
+        for callback in callbacks:
+            callback()
+    for post in posts:
+        assert not os.path.exists(post.image.path)
+    assert os.path.exists(shared.image.path), (
+        "Убедитесь, что файл, общий с постом другого автора, не удаляется."
+    )
+
+
+@pytest.mark.django_db
+def test_recently_reused_image_is_kept(
+    media, make_post, user, django_capture_on_commit_callbacks
+):
+    post = make_post(user, make_image())
+    path = post.image.path
+    os.utime(path)
+    with django_capture_on_commit_callbacks(execute=True):
+        post.delete()
+    assert os.path.exists(path)
+
+
+@pytest.mark.django_db
+def test_reconcile_media(media, make_post, user):
+    kept = make_post(user, make_image())
+    missing = make_post(user, make_image(color=(0, 0, 0)))
+    os.remove(missing.image.path)
+    orphan = media / "posts_images" / "orphan.jpg"
+    orphan.write_bytes(b"orphan")
+    age(orphan)
+
+    output = StringIO()
+    call_command("reconcile_media", stdout=output)
+    assert not orphan.exists()
+    assert os.path.exists(kept.image.path)
+    assert "posts_images/orphan.jpg" in output.getvalue()
+    assert f"Нет файла: {missing.image.name}" in output.getvalue(), (
+        "Убедитесь, что сверка сообщает о постах без файла изображения."
+    )
@@ -0,0 +1,41 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.views import get_post_cards
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url)
+    return len(queries)
+
+
+@pytest.mark.django_db
+def test_owner_profile_loads_no_deferred_fields(
+        user_client, mixer, user, published_category, published_location):
+    url = f"/profile/{user.username}/"
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        location=published_location,
+    )
+    single = count_queries(user_client, url)
+    mixer.cycle(5).blend(
+        "blog.Post", author=user, category=published_category,
+        location=published_location,
+    )
+    assert count_queries(user_client, url) == single, (
+        "Убедитесь, что шаблон карточки поста не подгружает отложенные поля."
+    )
+
+
+@pytest.mark.django_db
+def test_post_cards_skip_unused_columns(mixer, user, published_category):
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+    )
+    post = get_post_cards().get()
+    assert {"text", "created_at"} <= post.get_deferred_fields()
+    assert {"password", "email"} <= post.author.get_deferred_fields()
+    assert "description" in post.category.get_deferred_fields()
@@ -0,0 +1,45 @@
+import pytest
+from django.core.cache import cache
+
+from blog import forms as blog_forms
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_post_form_choices_are_published_and_cached(
+        mixer, django_assert_num_queries
+):
+    published = mixer.blend("blog.Location", is_published=True)
+    hidden = mixer.blend("blog.Location", is_published=False)
+    choices = dict(blog_forms.PostForm().fields["location"].choices)
+    assert published.id in choices
+    assert hidden.id not in choices, (
+        "Убедитесь, что в форме публикации не предлагаются снятые с"
+        " публикации местоположения."
+    )
+    with django_assert_num_queries(0):
+        blog_forms.PostForm().as_p()
+
+
+@pytest.mark.django_db
+def test_post_form_keeps_current_unpublished_value(mixer):
+    post = mixer.blend("blog.Post", location__is_published=False)
+    form = blog_forms.PostForm(instance=post)
+    assert post.location_id in dict(form.fields["location"].choices)
+
+
+@pytest.mark.django_db
+def test_large_location_set_uses_autocomplete(client, mixer, monkeypatch):
+    monkeypatch.setattr(blog_forms, "CHOICES_LIMIT", 3)
+    mixer.cycle(5).blend("blog.Location", is_published=True, name="Место")
+    field = blog_forms.PostForm().fields["location"]
+    assert "data-autocomplete-url" in field.widget.attrs
+    assert len(field.choices) == 1
+    results = client.get("/api/locations/?q=Мес").json()["results"]
+    assert len(results) == 5
@@ -0,0 +1,49 @@
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+
+from blog.ratelimit import take_token
+
+
+@pytest.mark.django_db
+def test_comment_rate_limit(settings, user_client, mixer, user,
+                            published_category):
+    settings.RATELIMITS = {'comment': {'user': (2, 60), 'ip': None}}
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+    )
+    url = f"/posts/{post.pk}/comment/"
+    for _ in range(2):
+        response = user_client.post(url, data={"text": "Текст"})
+        assert response.status_code == HTTPStatus.FOUND
+    response = user_client.post(url, data={"text": "Текст"})
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+        "Убедитесь, что частые комментарии отклоняются с кодом 429."
+    )
+    assert 0 < int(response["Retry-After"]) <= 60
+    assert post.comments.count() == 2
+
+
+@pytest.mark.django_db
+def test_post_rate_limit_by_ip(settings, user_client):
+    settings.RATELIMITS = {'post': {'user': None, 'ip': (1, 60)}}
+    user_client.post("/posts/create/", data={})
+    response = user_client.post("/posts/create/", data={})
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+
+
+def test_token_bucket_under_concurrency(settings):
+    settings.RATELIMIT_CACHE = 'default'
+    cache.clear()
+    with ThreadPoolExecutor(max_workers=20) as executor:
+        waits = list(executor.map(
+            lambda _: take_token('test:bucket', 5, 100), range(40)
+        ))
+    cache.clear()
+    assert waits.count(0) == 5, (
+        "Убедитесь, что при одновременных запросах выдаётся не больше "
+        "токенов, чем вмещает корзина."
+    )
@@ -0,0 +1,84 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Post
+from blog.signals import post_published
+
+
+@pytest.fixture
+def due_post(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(hours=1),
+    )
+    assert not post.is_live
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(minutes=1)
+    )
+    return post
+
+
+@pytest.mark.django_db
+def test_scheduler_publishes_due_posts(client, due_post):
+    assert due_post.title not in client.get("/").content.decode()
+    received = []
+
+    def handler(sender, post_ids, **kwargs):
+        received.extend(post_ids)
+
+    post_published.connect(handler)
+    try:
+        call_command("publish_scheduled", stdout=StringIO())
+    finally:
+        post_published.disconnect(handler)
+    assert received == [due_post.pk], (
+        "Убедитесь, что при публикации отложенных постов отправляется"
+        " сигнал `post_published`."
+    )
+    assert Post.objects.get(pk=due_post.pk).is_live
+    assert due_post.title in client.get("/").content.decode()
+
+
+@pytest.mark.django_db
+def test_scheduler_signals_only_posts_entering_feed(mixer, user, due_post):
+    hidden_category = mixer.blend("blog.Category", is_published=False)
+    hidden = [
+        mixer.blend(
+            "blog.Post", author=user, category=due_post.category,
+            is_published=False,
+        ),
+        mixer.blend(
+            "blog.Post", author=user, category=hidden_category,
+            is_published=True,
+        ),
+    ]
+    Post.objects.filter(pk__in=[post.pk for post in hidden]).update(
+        is_live=False, pub_date=timezone.now() - timedelta(minutes=1)
+    )
+    received = []
+
+    def handler(sender, post_ids, **kwargs):
+        received.extend(post_ids)
+
+    post_published.connect(handler)
+    try:
+        call_command("publish_scheduled", stdout=StringIO())
+    finally:
+        post_published.disconnect(handler)
+    assert received == [due_post.pk]
+    assert Post.objects.filter(
+        pk__in=[post.pk for post in hidden], is_live=True
+    ).count() == 2
+
+
+@pytest.mark.django_db
+def test_save_recomputes_is_live(mixer):
+    post = mixer.blend("blog.Post", pub_date=timezone.now())
+    assert post.is_live
+    post.pub_date = timezone.now() + timedelta(days=1)
+    post.save()
+    assert not Post.objects.get(pk=post.pk).is_live
@@ -0,0 +1,52 @@
+import pytest
+from django.contrib.sessions.backends.cached_db import SessionStore
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def session_queries(client):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/")
+    return response, [
+        query for query in queries if "django_session" in query["sql"]
+    ]
+
+
+@pytest.mark.django_db
+def test_anonymous_readers_get_no_session(client):
+    response, queries = session_queries(client)
+    assert "sessionid" not in response.cookies, (
+        "Убедитесь, что для анонимных читателей не создаётся сессия."
+    )
+    assert not queries
+
+
+@pytest.mark.django_db
+def test_logged_in_session_is_read_from_cache(user_client):
+    user_client.get("/")
+    response, queries = session_queries(user_client)
+    assert response.wsgi_request.user.is_authenticated
+    assert not queries, (
+        "Убедитесь, что сессия авторизованного пользователя читается из кеша."
+    )
+
+
+def test_session_cache_is_shared_between_workers(settings):
+    assert not isinstance(
+        caches[settings.SESSION_CACHE_ALIAS], LocMemCache
+    ), (
+        "Убедитесь, что сессии кешируются в хранилище, общем для всех"
+        " процессов."
+    )
+
+
+@pytest.mark.django_db
+def test_logout_removes_cached_session(user_client, settings):
+    user_client.get("/")
+    cache_key = SessionStore(user_client.cookies["sessionid"].value).cache_key
+    cache = caches[settings.SESSION_CACHE_ALIAS]
+    assert cache.get(cache_key) is not None
+    user_client.post("/auth/logout/")
+    assert cache.get(cache_key) is None
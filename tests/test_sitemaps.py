@@ -0,0 +1,95 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.sitemaps import PostSitemap
+
+
+@pytest.fixture(autouse=True)
+def sitemap_settings(settings, tmp_path):
+    settings.SITEMAP_ROOT = tmp_path
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def sitemap_posts(mixer, user, published_category):
+    visible = mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+    hidden = [
+        mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            is_published=False,
+        ),
+        mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            pub_date=timezone.now() + timedelta(days=1),
+        ),
+        mixer.blend(
+            "blog.Post", author=user, category__is_published=False,
+        ),
+    ]
+    return visible, hidden
+
+
+@pytest.mark.django_db
+def test_sitemap_rendered_on_request(client, sitemap_posts):
+    visible, hidden = sitemap_posts
+    response = client.get("/sitemap.xml")
+    assert response.status_code == 200
+    assert "/sitemap-posts-1.xml" in response.content.decode()
+
+    content = client.get("/sitemap-posts-1.xml").content.decode()
+    for post in visible:
+        assert f"/posts/{post.id}/<" in content, (
+            "Убедитесь, что опубликованные посты попадают в карту сайта."
+        )
+    for post in hidden:
+        assert f"/posts/{post.id}/<" not in content, (
+            "Убедитесь, что снятые с публикации, отложенные посты и посты из"
+            " скрытых категорий не попадают в карту сайта."
+        )
+    assert client.get("/sitemap-posts-2.xml").status_code == 404
+
+
+@pytest.mark.django_db
+def test_render_sitemaps_command(
+        client, settings, tmp_path, sitemap_posts, django_assert_num_queries
+):
+    settings.SITEMAP_PAGE_SIZE = 2
+    call_command("render_sitemaps", stdout=StringIO())
+    assert (tmp_path / "sitemap.xml").is_file()
+    assert (tmp_path / "sitemap-posts-1.xml").is_file()
+    assert (tmp_path / "sitemap-posts-2.xml").is_file()
+    assert not (tmp_path / "sitemap-posts-3.xml").exists()
+
+    with django_assert_num_queries(0):
+        response = client.get("/sitemap-posts-2.xml")
+        content = b"".join(response.streaming_content).decode()
+    assert f"/posts/{sitemap_posts[0][2].id}/<" in content
+
+
+@pytest.mark.django_db
+def test_sitemap_pages_use_keyset(settings, sitemap_posts):
+    settings.SITEMAP_PAGE_SIZE = 2
+    visible, hidden = sitemap_posts
+    sitemap = PostSitemap()
+    assert sitemap.get_num_pages() == 2
+    with CaptureQueriesContext(connection) as queries:
+        page = sitemap.get_page(2)
+    assert [post.id for post in page] == [visible[2].id]
+    assert len(queries) == 1
+    assert "OFFSET" not in queries[0]["sql"], (
+        "Убедитесь, что страницы карты сайта выбираются по первичному"
+        " ключу, а не через OFFSET."
+    )
+    assert sitemap.get_page(3) == []
@@ -0,0 +1,71 @@
+import gzip
+import json
+import re
+
+import pytest
+from django.contrib.staticfiles import finders
+from django.core.management import call_command
+from django_bootstrap5.core import css_url
+
+from blog.templatetags.assets import BOOTSTRAP_CSS
+
+
+@pytest.fixture
+def collected(settings, tmp_path):
+    settings.STATIC_ROOT = tmp_path
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {
+            "BACKEND": "blogicum.storage.CompressedManifestStaticFilesStorage",
+        },
+    }
+    call_command("collectstatic", interactive=False, verbosity=0)
+    return json.loads((tmp_path / "staticfiles.json").read_text())["paths"]
+
+
+def test_collectstatic_writes_hashed_and_compressed_files(
+        collected, tmp_path):
+    hashed = collected["img/fav/favicon.ico"]
+    assert hashed != "img/fav/favicon.ico"
+    original = (tmp_path / hashed).read_bytes()
+    assert gzip.decompress((tmp_path / f"{hashed}.gz").read_bytes()) == (
+        original
+    )
+    assert not (tmp_path / f"{collected['img/logo.png']}.gz").exists()
+
+
+def test_hashed_files_are_served_immutable(client, collected):
+    url = f"/static/{collected['img/fav/favicon.ico']}"
+    response = client.get(url, HTTP_ACCEPT_ENCODING="gzip, br")
+    assert response.status_code == 200
+    assert response["Content-Encoding"] == "gzip"
+    assert response["Content-Type"] == "image/vnd.microsoft.icon"
+    assert "immutable" in response["Cache-Control"], (
+        "Убедитесь, что файлы с хешем в имени кешируются навсегда."
+    )
+    assert "Accept-Encoding" in response["Vary"]
+
+    response = client.get(
+        url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=response["ETag"]
+    )
+    assert response.status_code == 304
+
+    response = client.get("/static/img/fav/favicon.ico")
+    assert "immutable" not in response["Cache-Control"]
+    assert not response.has_header("Content-Encoding")
+
+
+@pytest.mark.django_db
+def test_bootstrap_is_self_hosted(client):
+    content = client.get("/").content.decode()
+    assert "/static/vendor/bootstrap/css/bootstrap.min.css" in content, (
+        "Убедитесь, что Bootstrap раздаётся вместе со статикой проекта."
+    )
+    assert "cdn.jsdelivr.net" not in content
+
+
+def test_vendored_bootstrap_matches_pinned_version():
+    version = re.search(r"bootstrap@([\d.]+)/", css_url()["url"])[1]
+    path = finders.find(BOOTSTRAP_CSS)
+    with open(path, encoding="utf-8") as css:
+        assert f"Bootstrap  v{version} " in css.read(100)
@@ -0,0 +1,20 @@
+import pytest
+
+from blog.models import Category, Comment, Location, Post
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("model", [Post, Category, Location, Comment])
+def test_str_does_not_query(mixer, model, django_assert_num_queries):
+    mixer.cycle(5).blend(model)
+    items = list(model.objects.all())
+    with django_assert_num_queries(0):
+        [str(item) for item in items]
+
+
+@pytest.mark.django_db
+def test_describe_keeps_related_details(mixer):
+    post = mixer.blend("blog.Post")
+    description = Post.objects.get(id=post.id).describe()
+    assert post.author.username in description
+    assert post.category.slug in description
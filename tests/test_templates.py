@@ -0,0 +1,14 @@
+from django.template import engines
+
+from blogicum.warmup import warm_templates
+
+
+def test_warm_templates_fills_cached_loader():
+    [engine] = engines.all()
+    [loader] = engine.engine.template_loaders
+    loader.reset()
+    assert warm_templates() > 0
+    for name in ("base.html", "blog/index.html", "includes/post_card.html"):
+        assert name in loader.get_template_cache, (
+            "Убедитесь, что при запуске компилируются все шаблоны проекта."
+        )
@@ -0,0 +1,130 @@
+import pytest
+from django.core.cache import cache
+
+from blog import timeline
+from blog.models import TimelineEntry
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def blend_post(mixer, author, category):
+    return mixer.blend(
+        "blog.Post", author=author, category=category, is_published=True,
+    )
+
+
+@pytest.mark.django_db
+def test_follow_author_fans_out_on_write(
+        mixer, user, another_user, user_client, published_category
+):
+    old_post = blend_post(mixer, another_user, published_category)
+    timeline.follow(user, author=another_user)
+    assert TimelineEntry.objects.filter(user=user, post=old_post).exists(), (
+        "Убедитесь, что при подписке в персональную ленту попадают недавние"
+        " публикации автора."
+    )
+    new_post = blend_post(mixer, another_user, published_category)
+    assert TimelineEntry.objects.filter(user=user, post=new_post).exists()
+
+    response = user_client.get("/feed/")
+    assert [post.id for post in response.context["page_obj"]] == [
+        post.id for post in sorted(
+            (old_post, new_post), key=lambda post: post.pub_date,
+            reverse=True
+        )
+    ]
+
+    timeline.unfollow(user, author=another_user)
+    assert not TimelineEntry.objects.filter(user=user).exists()
+
+
+@pytest.mark.django_db
+def test_popular_author_is_read_on_request(
+        mixer, monkeypatch, user, another_user, published_category
+):
+    monkeypatch.setattr(timeline, "FANOUT_FOLLOWERS_LIMIT", 0)
+    timeline.follow(user, author=another_user)
+    post = blend_post(mixer, another_user, published_category)
+    assert not TimelineEntry.objects.filter(post=post).exists()
+    assert [entry.post_id for entry in timeline.get_timeline(user)] == [
+        post.id
+    ]
+
+
+@pytest.mark.django_db
+def test_timeline_length_is_bounded(
+        mixer, monkeypatch, user, another_user, published_category
+):
+    monkeypatch.setattr(timeline, "TIMELINE_LENGTH", 2)
+    timeline.follow(user, category=published_category)
+    for _ in range(4):
+        blend_post(mixer, another_user, published_category)
+    assert TimelineEntry.objects.filter(user=user).count() == 2
+
+
+@pytest.mark.django_db
+def test_follow_views(user_client, user, another_user, published_category):
+    user_client.post(f"/profile/{another_user.username}/follow/")
+    user_client.post(f"/category/{published_category.slug}/follow/")
+    assert user.follows.count() == 2
+    user_client.post(f"/profile/{another_user.username}/unfollow/")
+    assert user.follows.count() == 1
+    user_client.post(f"/profile/{user.username}/follow/")
+    assert user.follows.count() == 1
+
+
+@pytest.mark.django_db
+def test_draft_published_later_fans_out(
+        mixer, user, another_user, published_category
+):
+    timeline.follow(user, author=another_user)
+    post = mixer.blend(
+        "blog.Post", author=another_user, category=published_category,
+        is_published=False,
+    )
+    assert not TimelineEntry.objects.filter(post=post).exists()
+    post.is_published = True
+    post.save()
+    assert TimelineEntry.objects.filter(user=user, post=post).exists(), (
+        "Убедитесь, что снятая с черновика публикация попадает в"
+        " персональные ленты подписчиков."
+    )
+
+
+@pytest.mark.django_db
+def test_admin_publish_action_fans_out(
+        admin_client, mixer, user, another_user, published_category
+):
+    timeline.follow(user, category=published_category)
+    post = mixer.blend(
+        "blog.Post", author=another_user, category=published_category,
+        is_published=False,
+    )
+    admin_client.post("/admin/blog/post/", {
+        "action": "publish", "_selected_action": [post.id],
+    })
+    assert TimelineEntry.objects.filter(user=user, post=post).exists()
+
+
+@pytest.mark.django_db
+def test_unfollow_keeps_other_follows(
+        mixer, user, user_client, another_user, published_category
+):
+    other_author = mixer.blend("auth.User")
+    timeline.follow(user, author=another_user)
+    timeline.follow(user, author=other_author)
+    post = blend_post(mixer, another_user, published_category)
+    kept = blend_post(mixer, other_author, published_category)
+    timeline.unfollow(user, author=another_user)
+    assert not TimelineEntry.objects.filter(user=user, post=post).exists(), (
+        "Убедитесь, что после отписки посты автора пропадают из"
+        " персональной ленты, даже если остались другие подписки."
+    )
+    assert TimelineEntry.objects.filter(user=user, post=kept).exists()
+    response = user_client.get("/feed/")
+    assert [post.id for post in response.context["page_obj"]] == [kept.id]
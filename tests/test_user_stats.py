@@ -0,0 +1,75 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import UserStats
+
+
+@pytest.mark.django_db
+def test_user_stats_follow_writes(mixer, user, published_category):
+    posts = mixer.cycle(2).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+    )
+    comment = mixer.blend("blog.Comment", author=user, post=posts[0])
+    stats = UserStats.objects.get(user=user)
+    assert (stats.posts_count, stats.comments_count) == (2, 1)
+    assert stats.last_activity_at == comment.created_at
+
+    posts[1].is_published = False
+    posts[1].save()
+    comment.is_published = False
+    comment.save()
+    stats.refresh_from_db()
+    assert (stats.posts_count, stats.comments_count) == (1, 0), (
+        "Убедитесь, что статистика пользователя обновляется при записи."
+    )
+
+    posts[0].delete()
+    stats.refresh_from_db()
+    assert (stats.posts_count, stats.comments_count) == (0, 0)
+
+    user.delete()
+    assert not UserStats.objects.exists()
+
+
+@pytest.mark.django_db
+def test_profile_reads_stats(client, mixer, user, published_category):
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+    )
+    response = client.get(f"/profile/{user.username}/")
+    assert "Публикаций: 1" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_rebuild_user_stats(mixer, user, another_user, published_category):
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+    )
+    UserStats.objects.all().delete()
+    out = StringIO()
+    call_command("rebuild_user_stats", chunk_size=1, stdout=out)
+    assert UserStats.objects.get(user=user).posts_count == 1
+    assert UserStats.objects.get(user=another_user).posts_count == 0
+
+
+@pytest.mark.django_db
+def test_deleting_user_updates_other_commenters(
+    mixer, user, another_user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+    )
+    mixer.blend("blog.Comment", author=another_user, post=post)
+    assert UserStats.objects.get(user=another_user).comments_count == 1
+    user.delete()
+    assert UserStats.objects.get(user=another_user).comments_count == 0, (
+        "Убедитесь, что при удалении пользователя обновляется статистика"
+        " авторов комментариев к его постам."
+    )
+    assert not UserStats.objects.filter(user_id=user.id).exists()